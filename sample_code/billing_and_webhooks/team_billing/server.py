@@ -1,21 +1,42 @@
 import os
-from fastapi import FastAPI, HTTPException, Depends, Header
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Depends, Header, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from typing import Optional, List
 from datetime import datetime, timedelta
+import time
 import uuid
 from dotenv import load_dotenv
 from sqlmodel import SQLModel, Field, create_engine, Session, select, Relationship
-from pydantic import BaseModel
-from sqlalchemy import and_
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import Index, and_, bindparam, event, func
+from sqlalchemy.exc import DataError, IntegrityError
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create tables on startup rather than at import, so importing the module never opens app.db
+    SQLModel.metadata.create_all(engine)
+    flusher = asyncio.create_task(flush_usage_periodically())
+    yield
+    flusher.cancel()
+    flush_usage()
+
 app = FastAPI(
     title="Nebula Block Team Billing API",
     description="API for team management, usage tracking and invoicing",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Enable CORS
@@ -27,13 +48,49 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    # The stock handler's json.dumps fails on echoed NaN/inf inputs; orjson writes them as null
+    return ORJSONResponse(status_code=422, content={"detail": jsonable_encoder(exc.errors())})
+
 # Database Configuration
 DB_URL = os.getenv("DB_URL") or "sqlite:///./app.db"
-engine = create_engine(DB_URL, echo=True)
+# Statement logging formats every query on the request path; opt in with LOG_SQL=1
+LOG_SQL = os.getenv("LOG_SQL", "").lower() in ("1", "true", "yes")
+_is_sqlite = DB_URL.startswith("sqlite")
+engine = create_engine(
+    DB_URL,
+    echo=LOG_SQL,
+    connect_args={"check_same_thread": False} if _is_sqlite else {},
+)
+
+if _is_sqlite:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets readers run alongside the single writer; the rest is per-connection tuning
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
+def uuid7_hex() -> str:
+    """Time-ordered UUIDv7 as 32 hex chars, so new primary keys append to the end of the index."""
+    ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (
+        (ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76                        # version
+        | ((rand >> 62) & 0xFFF) << 64     # rand_a
+        | 0b10 << 62                       # variant
+        | (rand & ((1 << 62) - 1))         # rand_b
+    )
+    return f"{value:032x}"
 
 # SQLModel ORM Models
 class Team(SQLModel, table=True):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True, index=True)
+    id: str = Field(default_factory=uuid7_hex, primary_key=True, index=True)
     name: str
     owner_id: str
     api_key: str = Field(default_factory=lambda: str(uuid.uuid4()), index=True)
@@ -48,7 +105,7 @@ class TeamMember(SQLModel, table=True):
     team: Optional[Team] = Relationship(back_populates="members")
 
 class Invitation(SQLModel, table=True):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    id: str = Field(default_factory=uuid7_hex, primary_key=True)
     team_id: str = Field(foreign_key="team.id")
     email: str
     role: str
@@ -58,7 +115,9 @@ class Invitation(SQLModel, table=True):
     accepted: bool = False
 
 class UsageRecord(SQLModel, table=True):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    # Serves generate_invoice: equality on team/type, range on recorded_at
+    __table_args__ = (Index("ix_usage_team_type_time", "team_id", "usage_type", "recorded_at"),)
+    id: str = Field(default_factory=uuid7_hex, primary_key=True)
     team_id: str = Field(foreign_key="team.id")
     user_id: str
     usage_type: str
@@ -68,7 +127,7 @@ class UsageRecord(SQLModel, table=True):
     recorded_at: datetime = Field(default_factory=datetime.now)
 
 class Invoice(SQLModel, table=True):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    id: str = Field(default_factory=uuid7_hex, primary_key=True)
     team_id: str = Field(foreign_key="team.id")
     period_start: datetime
     period_end: datetime
@@ -77,14 +136,14 @@ class Invoice(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.now)
 
 class InvoiceLineItem(SQLModel, table=True):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    id: str = Field(default_factory=uuid7_hex, primary_key=True)
     invoice_id: str = Field(foreign_key="invoice.id")
     user_id: Optional[str]
     tokens_used: Optional[float]
     cost: Optional[float]
 
 class Payment(SQLModel, table=True):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    id: str = Field(default_factory=uuid7_hex, primary_key=True)
     invoice_id: str = Field(foreign_key="invoice.id")
     method: Optional[str]
     amount: Optional[float]
@@ -102,6 +161,9 @@ class TeamInviteRequest(BaseModel):
     inviter_id: str
 
 class UsageLogRequest(BaseModel):
+    # NaN/inf would be stored as NULL and fail the batched insert; reject them with a 422 instead
+    model_config = ConfigDict(allow_inf_nan=False)
+
     team_id: str
     user_id: str
     usage_type: str
@@ -119,134 +181,183 @@ class JoinTeamRequest(BaseModel):
 class PayInvoiceRequest(BaseModel):
     method: str
 
-# Create tables
-SQLModel.metadata.create_all(engine)
+def session_scope() -> Session:
+    """Session on the module engine, for work outside a request (startup, usage flushes)."""
+    # Nothing is written server-side, so objects stay valid after commit without a reload
+    return Session(engine, expire_on_commit=False)
 
 # Dependency for session
-from contextlib import contextmanager
-@contextmanager
 def get_session():
-    with Session(engine) as session:
+    with session_scope() as session:
         yield session
 
+# Usage records are queued in memory and written in batches, so /usage/log does
+# not pay for a commit per request. Anything reading usage must flush first.
+USAGE_BATCH_SIZE = 500
+USAGE_FLUSH_INTERVAL = 0.05  # seconds
+_pending_usage: List[dict] = []
+
+def flush_usage():
+    """Insert all queued usage records in one transaction.
+
+    If the database rejects the batch, the records are retried one by one and the
+    rejected ones are logged and dropped, so a bad record cannot block the queue.
+    """
+    if not _pending_usage:
+        return
+    batch = _pending_usage.copy()
+    _pending_usage.clear()
+    written = 0
+    try:
+        with session_scope() as session:
+            try:
+                session.bulk_insert_mappings(UsageRecord, batch)
+                session.commit()
+                written = len(batch)
+            except (DataError, IntegrityError):
+                session.rollback()
+                for record in batch:
+                    try:
+                        session.bulk_insert_mappings(UsageRecord, [record])
+                        session.commit()
+                    except (DataError, IntegrityError):
+                        session.rollback()
+                        logger.exception("Dropping usage record rejected by the database: %r", record)
+                    written += 1
+    except Exception:
+        # Keep the records not yet handled queued for the next flush
+        _pending_usage[:0] = batch[written:]
+        raise
+
+async def flush_usage_periodically():
+    while True:
+        await asyncio.sleep(USAGE_FLUSH_INTERVAL)
+        try:
+            flush_usage()
+        except Exception:
+            logger.exception("Failed to flush usage records")
+
+# Per-member usage totals for one team and period: one (user_id, tokens, cost) row per member.
+# Built once with bound parameters so every invoice reuses the same compiled statement.
+USAGE_BY_MEMBER_STMT = select(
+    UsageRecord.user_id,
+    func.sum(UsageRecord.amount).label("tokens"),
+    func.sum(UsageRecord.cost).label("cost")
+).where(
+    (UsageRecord.team_id == bindparam("team_id")) &
+    (UsageRecord.usage_type == 'inference') &
+    (UsageRecord.recorded_at >= bindparam("period_start")) &
+    (UsageRecord.recorded_at < bindparam("period_end"))
+).group_by(UsageRecord.user_id)
+
 # API Endpoints with SQLModel ORM
 @app.post("/teams/create")
-async def create_team(request: TeamCreateRequest):
+async def create_team(request: TeamCreateRequest, session: Session = Depends(get_session)):
     team_name = request.team_name
     owner_user_id = request.owner_user_id
-    with get_session() as session:
-        team = Team(name=team_name, owner_id=owner_user_id)
-        session.add(team)
-        session.flush()  # Ensure team.id is available
-        owner_member = TeamMember(team_id=team.id, user_id=owner_user_id, role="Owner")
-        session.add(owner_member)
-        session.commit()
-        session.refresh(team)
-        return {"team_id": team.id, "api_key": team.api_key}
+    team = Team(name=team_name, owner_id=owner_user_id)
+    session.add(team)
+    session.flush()  # Ensure team.id is available
+    owner_member = TeamMember(team_id=team.id, user_id=owner_user_id, role="Owner")
+    session.add(owner_member)
+    session.commit()
+    return {"team_id": team.id, "api_key": team.api_key}
 
 @app.post("/teams/invite")
-async def invite_team_member(request: TeamInviteRequest):
+async def invite_team_member(request: TeamInviteRequest, session: Session = Depends(get_session)):
     team_id = request.team_id
     email = request.email
     role = request.role
     inviter_id = request.inviter_id
-    with get_session() as session:
-        inviter = session.exec(select(TeamMember).where(and_(TeamMember.team_id == team_id, TeamMember.user_id == inviter_id))).first()
-        if not inviter or inviter.role not in ('Owner', 'Admin'):
-            raise HTTPException(status_code=403, detail="No permission to invite members.")
-        invitation = Invitation(team_id=team_id, email=email, role=role, inviter_id=inviter_id)
-        session.add(invitation)
-        session.commit()
-        session.refresh(invitation)
-        return {"invitation_token": invitation.token}
+    inviter = session.exec(select(TeamMember).where(and_(TeamMember.team_id == team_id, TeamMember.user_id == inviter_id))).first()
+    if not inviter or inviter.role not in ('Owner', 'Admin'):
+        raise HTTPException(status_code=403, detail="No permission to invite members.")
+    invitation = Invitation(team_id=team_id, email=email, role=role, inviter_id=inviter_id)
+    session.add(invitation)
+    session.commit()
+    return {"invitation_token": invitation.token}
 
 @app.post("/teams/join")
-async def join_team(request: JoinTeamRequest):
+async def join_team(request: JoinTeamRequest, session: Session = Depends(get_session)):
     invitation_token = request.invitation_token
     user_id = request.user_id
-    with get_session() as session:
-        # Validate invitation
-        invitation = session.exec(select(Invitation).where(Invitation.token == invitation_token)).first()
-        if not invitation:
-            raise HTTPException(status_code=404, detail="Invalid invitation token.")
-        if invitation.accepted:
-            raise HTTPException(status_code=400, detail="Invitation already accepted.")
-        # Add user to team_members
-        member = TeamMember(team_id=invitation.team_id, user_id=user_id, role=invitation.role)
-        session.add(member)
-        # Mark invitation as accepted
-        invitation.accepted = True
-        session.commit()
-        session.refresh(invitation)
-        return {"message": "Joined team successfully."}
+    # Validate invitation
+    invitation = session.exec(select(Invitation).where(Invitation.token == invitation_token)).first()
+    if not invitation:
+        raise HTTPException(status_code=404, detail="Invalid invitation token.")
+    if invitation.accepted:
+        raise HTTPException(status_code=400, detail="Invitation already accepted.")
+    # Add user to team_members
+    member = TeamMember(team_id=invitation.team_id, user_id=user_id, role=invitation.role)
+    session.add(member)
+    # Mark invitation as accepted
+    invitation.accepted = True
+    session.commit()
+    return {"message": "Joined team successfully."}
 
 @app.get("/teams/{team_id}/apikey")
-async def get_team_api_key(team_id: str, user_id: str = Header(..., alias="X-User-ID")):
-    with get_session() as session:
-        member = session.exec(select(TeamMember).where(and_(TeamMember.team_id == team_id, TeamMember.user_id == user_id))).first()
-        if not member:
-            raise HTTPException(status_code=403, detail="Not a team member.")
-        team = session.exec(select(Team).where(Team.id == team_id)).first()
-        if not team:
-            raise HTTPException(status_code=404, detail="Team not found.")
-        return {"api_key": team.api_key}
+async def get_team_api_key(team_id: str, user_id: str = Header(..., alias="X-User-ID"), session: Session = Depends(get_session)):
+    # One joined lookup: a membership row implies the team exists
+    api_key = session.exec(
+        select(Team.api_key)
+        .join(TeamMember, TeamMember.team_id == Team.id)
+        .where(and_(Team.id == team_id, TeamMember.user_id == user_id))
+    ).first()
+    if api_key is None:
+        raise HTTPException(status_code=403, detail="Not a team member.")
+    return {"api_key": api_key}
 
 @app.post("/billing/invoice/generate")
-async def generate_invoice(request: InvoiceGenerateRequest):
+async def generate_invoice(request: InvoiceGenerateRequest, session: Session = Depends(get_session)):
     team_id = request.team_id
-    with get_session() as session:
-        # Calculate current month period
-        now = datetime.now()
-        period_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        if now.month == 12:
-            next_month = now.replace(year=now.year+1, month=1, day=1)
-        else:
-            next_month = now.replace(month=now.month+1, day=1)
-        period_end = next_month
-        # Aggregate usage per user
-        member_breakdown = session.exec(
-            select(UsageRecord).where(
-                (UsageRecord.team_id == team_id) &
-                (UsageRecord.usage_type == 'inference') &
-                (UsageRecord.recorded_at >= period_start) &
-                (UsageRecord.recorded_at < period_end)
-            ).group_by(UsageRecord.user_id)
-        ).all()
-        total = sum([m.cost or 0 for m in member_breakdown])
-        invoice = Invoice(team_id=team_id, period_start=period_start, period_end=period_end, total=total, status="pending")
-        session.add(invoice)
-        for m in member_breakdown:
-            line_item = InvoiceLineItem(invoice_id=invoice.id, user_id=m.user_id, tokens_used=m.amount, cost=m.cost)
-            session.add(line_item)
-        session.commit()
-        session.refresh(invoice)
-        return {
-            "invoice_id": invoice.id,
-            "team_id": team_id,
-            "period_start": str(period_start.date()),
-            "period_end": str((period_end - timedelta(days=1)).date()),
-            "total": total,
-            "status": invoice.status,
-            "created_at": str(invoice.created_at),
-            "member_breakdown": [
-                {"user_id": m.user_id, "tokens_used": m.amount, "cost": m.cost} for m in member_breakdown
-            ]
-        }
+    try:
+        flush_usage()
+    except Exception:
+        # Records are still queued; billing now would leave them off the invoice
+        logger.exception("Failed to flush usage records")
+        raise HTTPException(status_code=503, detail="Usage records could not be saved; retry later.")
+    # Calculate current month period: [first of this month, first of next month)
+    now = datetime.now()
+    period_start = datetime(now.year, now.month, 1)
+    period_end = datetime(now.year + now.month // 12, now.month % 12 + 1, 1)
+    # Aggregate usage per user in SQL
+    member_breakdown = session.exec(
+        USAGE_BY_MEMBER_STMT,
+        params={"team_id": team_id, "period_start": period_start, "period_end": period_end}
+    ).all()
+    total = sum([m.cost or 0 for m in member_breakdown])
+    invoice = Invoice(team_id=team_id, period_start=period_start, period_end=period_end, total=total, status="pending")
+    session.add(invoice)
+    session.flush()  # Invoice row must exist before its line items reference it
+    # Line items are insert-only, so skip the unit of work and insert them in one batch
+    session.bulk_insert_mappings(InvoiceLineItem, [
+        {"id": uuid7_hex(), "invoice_id": invoice.id, "user_id": m.user_id, "tokens_used": m.tokens, "cost": m.cost}
+        for m in member_breakdown
+    ])
+    session.commit()
+    return {
+        "invoice_id": invoice.id,
+        "team_id": team_id,
+        "period_start": str(period_start.date()),
+        "period_end": str((period_end - timedelta(days=1)).date()),
+        "total": total,
+        "status": invoice.status,
+        "created_at": str(invoice.created_at),
+        "member_breakdown": [
+            {"user_id": m.user_id, "tokens_used": m.tokens, "cost": m.cost} for m in member_breakdown
+        ]
+    }
 
 @app.post("/usage/log")
 async def log_usage(request: UsageLogRequest):
-    with get_session() as session:
-        usage = UsageRecord(
-            team_id=request.team_id,
-            user_id=request.user_id,
-            usage_type=request.usage_type,
-            amount=request.amount,
-            unit=request.unit,
-            cost=request.cost
-        )
-        session.add(usage)
-        session.commit()
-        return {"message": "Usage logged."}
+    _pending_usage.append(request.model_dump() | {"id": uuid7_hex(), "recorded_at": datetime.now()})
+    if len(_pending_usage) >= USAGE_BATCH_SIZE:
+        # The record is queued either way; a failed flush is retried by the periodic flusher
+        try:
+            flush_usage()
+        except Exception:
+            logger.exception("Failed to flush usage records")
+    return {"message": "Usage logged."}
 
 @app.get("/billing/invoice/{invoice_id}/pdf")
 async def download_invoice_pdf(invoice_id: str):
@@ -254,20 +365,17 @@ async def download_invoice_pdf(invoice_id: str):
     return {"pdf_url": f"https://example.com/invoices/{invoice_id}.pdf"}
 
 @app.post("/billing/invoice/{invoice_id}/pay")
-async def pay_invoice(invoice_id: str, request: PayInvoiceRequest):
+async def pay_invoice(invoice_id: str, request: PayInvoiceRequest, session: Session = Depends(get_session)):
     method = request.method
-    with get_session() as session:
-        invoice = session.exec(select(Invoice).where(Invoice.id == invoice_id)).first()
-        if not invoice:
-            raise HTTPException(status_code=404, detail="Invoice not found.")
-        invoice.status = "paid"
-        payment = Payment(invoice_id=invoice.id, method=method, amount=0, status="paid")
-        session.add(invoice)
-        session.add(payment)
-        session.commit()
-        session.refresh(invoice)
-        session.refresh(payment)
-        return {"status": "paid"}
+    invoice = session.exec(select(Invoice).where(Invoice.id == invoice_id)).first()
+    if not invoice:
+        raise HTTPException(status_code=404, detail="Invoice not found.")
+    invoice.status = "paid"
+    payment = Payment(invoice_id=invoice.id, method=method, amount=0, status="paid")
+    session.add(invoice)
+    session.add(payment)
+    session.commit()
+    return {"status": "paid"}
 
 # Add other endpoints with SQLModel ORM...
 
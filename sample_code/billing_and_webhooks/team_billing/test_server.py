@@ -1,30 +1,31 @@
 import os
 import pytest
 from fastapi.testclient import TestClient
+import server
 from server import app, SQLModel, get_session
 from sqlmodel import Session, create_engine
-from contextlib import contextmanager
+from sqlalchemy.pool import StaticPool
 import tempfile
 import uuid
 
-# Use in-memory SQLite for testing, with shared connection
-TEST_DB_URL = "sqlite:///:memory:"
-engine = create_engine(TEST_DB_URL, echo=False, connect_args={"check_same_thread": False})
-connection = engine.connect()
+# Use in-memory SQLite for testing; StaticPool hands every session the same connection
+TEST_DB_URL = "sqlite://"
+engine = create_engine(TEST_DB_URL, echo=False, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+# Startup and the background usage flush open sessions on server.engine directly
+server.engine = engine
 
-# Override the get_session dependency to use the shared connection
-@contextmanager
+# Override the get_session dependency to use the in-memory database
 def override_get_session():
-    with Session(bind=connection) as session:
+    with Session(engine, expire_on_commit=False) as session:
         yield session
 
 app.dependency_overrides[get_session] = override_get_session
 
 @pytest.fixture(scope="module", autouse=True)
 def setup_db():
-    SQLModel.metadata.create_all(connection)
+    SQLModel.metadata.create_all(engine)
     yield
-    SQLModel.metadata.drop_all(connection)
+    SQLModel.metadata.drop_all(engine)
 
 @pytest.fixture(scope="module")
 def test_client():
@@ -129,6 +130,82 @@ def test_log_usage_and_generate_invoice(test_client, team_info):
     assert "member_breakdown" in data
     assert any(mb["user_id"] == "user_789" for mb in data["member_breakdown"])
 
+def test_invoice_sums_usage_per_member(test_client):
+    # Fresh team so the invoice total only covers the records logged here
+    team_resp = test_client.post(
+        "/teams/create",
+        json={"team_name": "Sum Team", "owner_user_id": "user_sum"}
+    )
+    assert team_resp.status_code == 200
+    team_id = team_resp.json()["team_id"]
+    for amount, cost in [(100, 0.1), (200, 0.2)]:
+        resp = test_client.post(
+            "/usage/log",
+            json={
+                "team_id": team_id,
+                "user_id": "user_sum",
+                "usage_type": "inference",
+                "amount": amount,
+                "unit": "tokens",
+                "cost": cost
+            }
+        )
+        assert resp.status_code == 200
+    invoice_resp = test_client.post(
+        "/billing/invoice/generate",
+        json={"team_id": team_id}
+    )
+    assert invoice_resp.status_code == 200
+    data = invoice_resp.json()
+    assert len(data["member_breakdown"]) == 1
+    member = data["member_breakdown"][0]
+    assert member["user_id"] == "user_sum"
+    assert member["tokens_used"] == 300
+    assert member["cost"] == pytest.approx(0.3)
+    assert data["total"] == pytest.approx(0.3)
+
+def test_log_usage_rejects_nan(test_client, team_info):
+    resp = test_client.post(
+        "/usage/log",
+        content='{"team_id": "%s", "user_id": "user_nan", "usage_type": "inference", '
+                '"amount": NaN, "unit": "tokens", "cost": 0.1}' % team_info["team_id"],
+        headers={"Content-Type": "application/json"}
+    )
+    assert resp.status_code == 422
+
+def test_bad_queued_record_does_not_block_usage(test_client):
+    team_resp = test_client.post(
+        "/teams/create",
+        json={"team_name": "Queue Team", "owner_user_id": "user_queue"}
+    )
+    assert team_resp.status_code == 200
+    team_id = team_resp.json()["team_id"]
+    # A record the database rejects (NULL amount), queued ahead of a valid one
+    server._pending_usage.append({
+        "id": server.uuid7_hex(), "team_id": team_id, "user_id": "user_queue", "usage_type": "inference",
+        "amount": None, "unit": "tokens", "cost": 1.0, "recorded_at": server.datetime.now()
+    })
+    resp = test_client.post(
+        "/usage/log",
+        json={
+            "team_id": team_id,
+            "user_id": "user_queue",
+            "usage_type": "inference",
+            "amount": 100,
+            "unit": "tokens",
+            "cost": 0.1
+        }
+    )
+    assert resp.status_code == 200
+    invoice_resp = test_client.post(
+        "/billing/invoice/generate",
+        json={"team_id": team_id}
+    )
+    assert invoice_resp.status_code == 200
+    data = invoice_resp.json()
+    assert data["member_breakdown"] == [{"user_id": "user_queue", "tokens_used": 100, "cost": 0.1}]
+    assert server._pending_usage == []
+
 def test_invoice_pdf_and_payment(test_client, invoice_id):
     # Download PDF
     pdf_resp = test_client.get(f"/billing/invoice/{invoice_id}/pdf")
@@ -2,6 +2,7 @@ from fastapi import FastAPI, HTTPException, Header, Depends, Query, Path
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 import os
+import hmac
 from dotenv import load_dotenv
 import time
 import uuid
@@ -27,15 +28,18 @@ class VerificationResponse(BaseModel):
     timestamp: int
     details: Dict[str, Any] = Field(default_factory=dict)
 
+# Expected access token, read once at import
+EXPECTED_TOKEN = os.getenv("ACCESS_TOKEN", "demo-access-token").encode()
+
 # Verify access token
 async def verify_token(authorization: str = Header(...)):
     if not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Invalid authorization header")
     
-    token = authorization.split(" ")[1]
-    expected_token = os.getenv("ACCESS_TOKEN", "demo-access-token")
+    token = authorization[7:]
     
-    if token != expected_token:
+    # Constant-time comparison so response timing does not leak the token
+    if not hmac.compare_digest(token.encode(), EXPECTED_TOKEN):
         raise HTTPException(status_code=401, detail="Invalid access token")
     
     return token
@@ -52,6 +56,7 @@ async def verify_user(
     """
     # Generate a unique verification ID
     verification_id = str(uuid.uuid4())
+    now = int(time.time())
     
     # In a real implementation, you would:
     # 1. Validate the verification data
@@ -76,7 +81,7 @@ async def verify_user(
     if debug:
         details["debug_info"] = {
             "request_data": request.verification_data,
-            "server_time": int(time.time()),
+            "server_time": now,
             "processing_time_ms": 42
         }
     
@@ -84,7 +89,7 @@ async def verify_user(
         success=success,
         message=message,
         verification_id=verification_id,
-        timestamp=int(time.time()),
+        timestamp=now,
         details=details
     )
 
@@ -98,14 +103,15 @@ async def verification_status(
     """
     # In a real implementation, you would look up the verification in your database
     # For demo purposes, we'll return a mock status
+    now = int(time.time())
     return {
         "verification_id": verification_id,
         "status": "completed",
-        "timestamp": int(time.time()),
+        "timestamp": now,
         "details": {
             "user_id": "user_12345",
             "quest_id": "quest_abc123",
-            "completion_time": int(time.time()) - 3600
+            "completion_time": now - 3600
         }
     }
 
@@ -1,17 +1,52 @@
 from fastapi import FastAPI, HTTPException, Header, Depends, Query, Path
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import os
+import hmac
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 import time
 import uuid
-import requests
+import httpx
 import json
 
 # Load environment variables
 load_dotenv()
 
-app = FastAPI(title="Mission Quest Verification Webhook")
+# Shared client for calls to the verification service; keeps connections alive between requests
+http_client: Optional[httpx.AsyncClient] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global http_client
+    http_client = httpx.AsyncClient(
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=100)
+    )
+    yield
+    await http_client.aclose()
+
+app = FastAPI(
+    title="Mission Quest Verification Webhook",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
+
+# Successful status lookups, reused for a short time so polling clients do not hit the upstream service
+STATUS_CACHE_TTL = 30  # seconds
+STATUS_CACHE_MAX_SIZE = 10_000
+_status_cache: Dict[str, Tuple[float, Any]] = {}
+
+def _cache_status(verification_id: str, status: Any):
+    if len(_status_cache) >= STATUS_CACHE_MAX_SIZE:
+        now = time.monotonic()
+        for key in [key for key, (expires, _) in _status_cache.items() if expires <= now]:
+            del _status_cache[key]
+        if len(_status_cache) >= STATUS_CACHE_MAX_SIZE:
+            # Still full: drop the oldest entry (dicts keep insertion order)
+            del _status_cache[next(iter(_status_cache))]
+    _status_cache[verification_id] = (time.monotonic() + STATUS_CACHE_TTL, status)
 
 # Request model
 class VerificationRequest(BaseModel):
@@ -40,15 +75,18 @@ class DeveloperVerificationResponse(BaseModel):
     timestamp: int
     details: Dict[str, Any] = Field(default_factory=dict)
 
+# Expected access token, read once at import
+EXPECTED_TOKEN = os.getenv("ACCESS_TOKEN", "demo-access-token").encode()
+
 # Verify access token
 async def verify_token(authorization: str = Header(...)):
     if not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Invalid authorization header")
     
-    token = authorization.split(" ")[1]
-    expected_token = os.getenv("ACCESS_TOKEN", "demo-access-token")
+    token = authorization[7:]
     
-    if token != expected_token:
+    # Constant-time comparison so response timing does not leak the token
+    if not hmac.compare_digest(token.encode(), EXPECTED_TOKEN):
         raise HTTPException(status_code=401, detail="Invalid access token")
     
     return token
@@ -67,21 +105,22 @@ async def verify_user(request: VerificationRequest, token: str = Depends(verify_
         "Content-Type": "application/json"
     }
     
-    # Create the verification data
+    # Create the verification data; both timestamps share one clock read
+    now = int(time.time())
     verification_data = {
         "user_id": request.user_id,
         "username": request.username,
         "quest_id": request.quest_id,
         "verification_data": {
             "source": "webhook_server",
-            "verification_timestamp": int(time.time())
+            "verification_timestamp": now
         },
-        "timestamp": int(time.time())
+        "timestamp": now
     }
     
     try:
         # Forward the request to the verification service
-        response = requests.post(verification_url, json=verification_data, headers=headers)
+        response = await http_client.post(verification_url, json=verification_data, headers=headers)
         
         if response.status_code == 200:
             verification_response = response.json()
@@ -95,7 +134,7 @@ async def verify_user(request: VerificationRequest, token: str = Depends(verify_
                 detail=f"Verification service error: {response.text}"
             )
             
-    except requests.exceptions.RequestException as e:
+    except httpx.RequestError as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error connecting to verification service: {str(e)}"
@@ -113,6 +152,7 @@ async def developer_verify(
     """
     # Generate a unique verification ID
     verification_id = str(uuid.uuid4())
+    now = int(time.time())
     
     # In a real implementation, you would:
     # 1. Validate the verification data
@@ -137,7 +177,7 @@ async def developer_verify(
     if debug:
         details["debug_info"] = {
             "request_data": request.verification_data,
-            "server_time": int(time.time()),
+            "server_time": now,
             "processing_time_ms": 42
         }
     
@@ -145,7 +185,7 @@ async def developer_verify(
         success=success,
         message=message,
         verification_id=verification_id,
-        timestamp=int(time.time()),
+        timestamp=now,
         details=details
     )
 
@@ -157,6 +197,10 @@ async def verification_status(
     """
     Check the status of a previous verification by forwarding the request to the verification service.
     """
+    cached = _status_cache.get(verification_id)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    
     # Verification service URL
     status_url = f"http://localhost:8001/api/status/{verification_id}"
     
@@ -167,17 +211,19 @@ async def verification_status(
     
     try:
         # Forward the request to the verification service
-        response = requests.get(status_url, headers=headers)
+        response = await http_client.get(status_url, headers=headers)
         
         if response.status_code == 200:
-            return response.json()
+            status = response.json()
+            _cache_status(verification_id, status)
+            return status
         else:
             raise HTTPException(
                 status_code=response.status_code,
                 detail=f"Verification service error: {response.text}"
             )
             
-    except requests.exceptions.RequestException as e:
+    except httpx.RequestError as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error connecting to verification service: {str(e)}"
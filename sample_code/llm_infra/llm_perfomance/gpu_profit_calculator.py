@@ -1,14 +1,11 @@
 from fastapi import FastAPI, Request, Form
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
-from fastapi.staticfiles import StaticFiles
 import uvicorn
 import os
-import sys
-sys.path.append('scripts')
 
-from model_settings import ALL_MODELS, get_model_by_name, format_price
-from database import DatabaseManager, GPUConfig, ModelConfig
+from scripts.model_settings import ALL_MODELS, get_model_by_name, format_price
+from scripts.database import DatabaseManager, GPUConfig, ModelConfig
 
 app = FastAPI(title="GPU Profit Calculator")
 
@@ -16,17 +13,18 @@ app = FastAPI(title="GPU Profit Calculator")
 templates_dir = "templates"
 os.makedirs(templates_dir, exist_ok=True)
 
-# Create static directory if it doesn't exist
-static_dir = "templates/static"
-os.makedirs(static_dir, exist_ok=True)
-
 templates = Jinja2Templates(directory=templates_dir)
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="templates/static"), name="static")
+# (substring in GPU name, short name used by the calculator form)
+_SHORT_GPU_NEEDLES = (
+    ("H100", "H100"),
+    ("A100", "A100"),
+    ("RTX 3090", "RTX 3090"),
+    ("RTX 3080", "RTX 3080"),
+)
 
 @app.get("/", response_class=HTMLResponse)
-async def gpu_profit_calculator(request: Request):
+def gpu_profit_calculator(request: Request):
     """Render the GPU profit calculator form."""
     # Get models from database
     db = DatabaseManager("scripts/llm_calculator.db")
@@ -38,17 +36,12 @@ async def gpu_profit_calculator(request: Request):
     gpu_configs = db.get_gpu_configs()
     
     # Create GPU name mapping from short names to full database names
-    gpu_name_mapping = {}
-    for gpu in gpu_configs:
-        # Map short names to full names
-        if "H100" in gpu.name:
-            gpu_name_mapping["H100"] = gpu.name
-        elif "A100" in gpu.name:
-            gpu_name_mapping["A100"] = gpu.name
-        elif "RTX 3090" in gpu.name:
-            gpu_name_mapping["RTX 3090"] = gpu.name
-        elif "RTX 3080" in gpu.name:
-            gpu_name_mapping["RTX 3080"] = gpu.name
+    gpu_name_mapping = {
+        short: gpu.name
+        for gpu in gpu_configs
+        for needle, short in _SHORT_GPU_NEEDLES
+        if needle in gpu.name
+    }
     
     return templates.TemplateResponse("gpu_profit_calculator.html", {
         "request": request,
@@ -59,7 +52,7 @@ async def gpu_profit_calculator(request: Request):
     })
 
 @app.get("/settings", response_class=HTMLResponse)
-async def settings_page(request: Request):
+def settings_page(request: Request):
     """Render the settings page."""
     db = DatabaseManager("scripts/llm_calculator.db")
     gpu_configs = db.get_gpu_configs()
@@ -71,7 +64,7 @@ async def settings_page(request: Request):
     })
 
 @app.post("/settings/add-gpu")
-async def add_gpu(
+def add_gpu(
     name: str = Form(...),
     cost_per_hour: float = Form(...),
     vram_gb: int = Form(...),
@@ -92,7 +85,7 @@ async def add_gpu(
         return JSONResponse({"success": False, "message": f"Error adding GPU: {str(e)}"})
 
 @app.post("/settings/update-gpu")
-async def update_gpu(
+def update_gpu(
     name: str = Form(...),
     cost_per_hour: float = Form(...),
     vram_gb: int = Form(...),
@@ -102,12 +95,7 @@ async def update_gpu(
     try:
         db = DatabaseManager("scripts/llm_calculator.db")
         # First get the existing GPU config
-        gpu_configs = db.get_gpu_configs()
-        existing_gpu = None
-        for gpu in gpu_configs:
-            if gpu.name == name:
-                existing_gpu = gpu
-                break
+        existing_gpu = db.get_gpu_config_by_name(name)
         
         if existing_gpu:
             # Update the existing config
@@ -125,7 +113,7 @@ async def update_gpu(
         return JSONResponse({"success": False, "message": f"Error updating GPU: {str(e)}"})
 
 @app.delete("/settings/delete-gpu/{gpu_name}")
-async def delete_gpu(gpu_name: str):
+def delete_gpu(gpu_name: str):
     """Delete a GPU configuration."""
     try:
         db = DatabaseManager("scripts/llm_calculator.db")
@@ -138,7 +126,7 @@ async def delete_gpu(gpu_name: str):
         return JSONResponse({"success": False, "message": f"Error deleting GPU: {str(e)}"})
 
 @app.post("/settings/add-model")
-async def add_model(
+def add_model(
     name: str = Form(...),
     slug: str = Form(...),
     parameters_b: float = Form(...),
@@ -175,7 +163,7 @@ async def add_model(
         return JSONResponse({"success": False, "message": f"Error adding model: {str(e)}"})
 
 @app.post("/settings/update-model")
-async def update_model(
+def update_model(
     name: str = Form(...),
     slug: str = Form(None),
     parameters_b: float = Form(None),
@@ -234,7 +222,7 @@ async def update_model(
         return JSONResponse({"success": False, "message": f"Error updating model: {str(e)}"})
 
 @app.delete("/settings/delete-model/{model_name}")
-async def delete_model(model_name: str):
+def delete_model(model_name: str):
     """Delete a model configuration."""
     try:
         db = DatabaseManager("scripts/llm_calculator.db")
@@ -247,7 +235,7 @@ async def delete_model(model_name: str):
         return JSONResponse({"success": False, "message": f"Error deleting model: {str(e)}"})
 
 @app.get("/settings/get-model/{model_name}")
-async def get_model(model_name: str):
+def get_model(model_name: str):
     """Get model data by name for editing."""
     try:
         db = DatabaseManager("scripts/llm_calculator.db")
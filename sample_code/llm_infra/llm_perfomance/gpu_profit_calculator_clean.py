@@ -1,53 +1,100 @@
-from fastapi import FastAPI, Request, Form
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, Request, Form, Depends
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.templating import Jinja2Templates
-from fastapi.staticfiles import StaticFiles
+from jinja2 import FileSystemBytecodeCache, select_autoescape
 import uvicorn
 import os
-import sys
-sys.path.append('scripts')
+import time
 
-from model_settings import ALL_MODELS, get_model_by_name, format_price
-from database import DatabaseManager, GPUConfig
+from scripts.model_settings import ALL_MODELS, get_model_by_name, format_price, clear_compatibility_cache
+from scripts.database import DatabaseManager, GPUConfig
 
-app = FastAPI(title="GPU Profit Calculator")
+app = FastAPI(title="GPU Profit Calculator", default_response_class=ORJSONResponse)
 
-# Create templates directory if it doesn't exist
 templates_dir = "templates"
-os.makedirs(templates_dir, exist_ok=True)
-
-# Create static directory if it doesn't exist
-static_dir = "templates/static"
-os.makedirs(static_dir, exist_ok=True)
 
 templates = Jinja2Templates(directory=templates_dir)
+# Templates only change on deploy: skip the per-render stat and keep compiled bytecode
+templates.env.auto_reload = False
+templates.env.autoescape = select_autoescape(["html"])
+templates.env.bytecode_cache = FileSystemBytecodeCache()
+
+# (substring in GPU name, short name used by the calculator form)
+_SHORT_GPU_NEEDLES = (
+    ("H100", "H100"),
+    ("A100", "A100"),
+    ("RTX 3090", "RTX 3090"),
+    ("RTX 3080", "RTX 3080"),
+)
+
+@app.on_event("startup")
+def ensure_dirs():
+    """Create the templates directory if it doesn't exist."""
+    if not os.path.isdir(templates_dir):
+        os.makedirs(templates_dir, exist_ok=True)
+
+@app.on_event("startup")
+def init_db():
+    """Create the shared DatabaseManager once instead of per request."""
+    app.state.db = DatabaseManager()
+    # Bumped by every GPU mutation; keys the page data cache and the ETag.
+    # The boot id keeps ETags from a previous process from matching.
+    app.state.boot_id = int(time.time())
+    app.state.gpu_configs_version = 0
+    app.state.gpu_data_cache = None
+
+@app.on_event("startup")
+def warm_templates():
+    """Compile the page templates before the first request."""
+    templates.get_template("gpu_profit_calculator.html")
+    templates.get_template("settings.html")
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="templates/static"), name="static")
+def get_db(request: Request) -> DatabaseManager:
+    """Return the shared DatabaseManager."""
+    return request.app.state.db
+
+def bump_gpu_configs_version():
+    """Invalidate cached GPU page data after a mutation."""
+    app.state.gpu_configs_version += 1
+    clear_compatibility_cache()
+
+def get_gpu_page_data(db: DatabaseManager):
+    """Return (gpu_configs, gpu_name_mapping), reusing them until the next mutation."""
+    version = app.state.gpu_configs_version
+    cached = app.state.gpu_data_cache
+    if cached is not None and cached[0] == version:
+        return cached[1], cached[2]
+    
+    gpu_configs = db.get_gpu_configs()
+    
+    # Create GPU name mapping from short names to full database names
+    gpu_name_mapping = {
+        short: gpu.name
+        for gpu in gpu_configs
+        for needle, short in _SHORT_GPU_NEEDLES
+        if needle in gpu.name
+    }
+    
+    app.state.gpu_data_cache = (version, gpu_configs, gpu_name_mapping)
+    return gpu_configs, gpu_name_mapping
+
+def gpu_etag() -> str:
+    """Weak ETag for pages whose content only changes with the GPU configs."""
+    return f'W/"gpu-{app.state.boot_id}-{app.state.gpu_configs_version}"'
 
 @app.get("/", response_class=HTMLResponse)
-async def gpu_profit_calculator(request: Request):
+def gpu_profit_calculator(request: Request, db: DatabaseManager = Depends(get_db)):
     """Render the GPU profit calculator form."""
+    etag = gpu_etag()
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
     # Get models from settings
     free_models = [m for m in ALL_MODELS if m.is_free]
     paid_models = [m for m in ALL_MODELS if not m.is_free]
     
     # Get GPU configurations from database
-    db = DatabaseManager()
-    gpu_configs = db.get_gpu_configs()
-    
-    # Create GPU name mapping from short names to full database names
-    gpu_name_mapping = {}
-    for gpu in gpu_configs:
-        # Map short names to full names
-        if "H100" in gpu.name:
-            gpu_name_mapping["H100"] = gpu.name
-        elif "A100" in gpu.name:
-            gpu_name_mapping["A100"] = gpu.name
-        elif "RTX 3090" in gpu.name:
-            gpu_name_mapping["RTX 3090"] = gpu.name
-        elif "RTX 3080" in gpu.name:
-            gpu_name_mapping["RTX 3080"] = gpu.name
+    gpu_configs, gpu_name_mapping = get_gpu_page_data(db)
     
     return templates.TemplateResponse("gpu_profit_calculator.html", {
         "request": request,
@@ -55,13 +102,13 @@ async def gpu_profit_calculator(request: Request):
         "paid_models": paid_models,
         "gpu_configs": gpu_configs,
         "gpu_name_mapping": gpu_name_mapping
-    })
+    }, headers={"ETag": etag})
 
 @app.get("/settings", response_class=HTMLResponse)
-async def settings_page(request: Request):
+def settings_page(request: Request, db: DatabaseManager = Depends(get_db)):
     """Render the settings page."""
-    db = DatabaseManager()
-    gpu_configs = db.get_gpu_configs()
+    # No ETag here: the page also lists model configs, which gpu_configs_version does not track
+    gpu_configs, _ = get_gpu_page_data(db)
     model_configs = db.get_model_configs()
     return templates.TemplateResponse("settings.html", {
         "request": request,
@@ -70,15 +117,15 @@ async def settings_page(request: Request):
     })
 
 @app.post("/settings/add-gpu")
-async def add_gpu(
+def add_gpu(
     name: str = Form(...),
     cost_per_hour: float = Form(...),
     vram_gb: int = Form(...),
-    gpu_type: str = Form(...)
+    gpu_type: str = Form(...),
+    db: DatabaseManager = Depends(get_db)
 ):
     """Add a new GPU configuration."""
     try:
-        db = DatabaseManager()
         gpu_config = GPUConfig(
             name=name,
             cost_per_hour=cost_per_hour,
@@ -86,27 +133,23 @@ async def add_gpu(
             gpu_type=gpu_type
         )
         gpu_id = db.insert_gpu_config(gpu_config)
-        return JSONResponse({"success": True, "message": f"GPU {name} added successfully", "gpu_id": gpu_id})
+        bump_gpu_configs_version()
+        return ORJSONResponse({"success": True, "message": f"GPU {name} added successfully", "gpu_id": gpu_id})
     except Exception as e:
-        return JSONResponse({"success": False, "message": f"Error adding GPU: {str(e)}"})
+        return ORJSONResponse({"success": False, "message": f"Error adding GPU: {str(e)}"})
 
 @app.post("/settings/update-gpu")
-async def update_gpu(
+def update_gpu(
     name: str = Form(...),
     cost_per_hour: float = Form(...),
     vram_gb: int = Form(...),
-    gpu_type: str = Form(...)
+    gpu_type: str = Form(...),
+    db: DatabaseManager = Depends(get_db)
 ):
     """Update an existing GPU configuration."""
     try:
-        db = DatabaseManager()
         # First get the existing GPU config
-        gpu_configs = db.get_gpu_configs()
-        existing_gpu = None
-        for gpu in gpu_configs:
-            if gpu.name == name:
-                existing_gpu = gpu
-                break
+        existing_gpu = db.get_gpu_config_by_name(name)
         
         if existing_gpu:
             # Update the existing config
@@ -115,26 +158,27 @@ async def update_gpu(
             existing_gpu.gpu_type = gpu_type
             success = db.update_gpu_config(existing_gpu)
             if success:
-                return JSONResponse({"success": True, "message": f"GPU {name} updated successfully"})
+                bump_gpu_configs_version()
+                return ORJSONResponse({"success": True, "message": f"GPU {name} updated successfully"})
             else:
-                return JSONResponse({"success": False, "message": f"Failed to update GPU {name}"})
+                return ORJSONResponse({"success": False, "message": f"Failed to update GPU {name}"})
         else:
-            return JSONResponse({"success": False, "message": f"GPU {name} not found"})
+            return ORJSONResponse({"success": False, "message": f"GPU {name} not found"})
     except Exception as e:
-        return JSONResponse({"success": False, "message": f"Error updating GPU: {str(e)}"})
+        return ORJSONResponse({"success": False, "message": f"Error updating GPU: {str(e)}"})
 
 @app.delete("/settings/delete-gpu/{gpu_name}")
-async def delete_gpu(gpu_name: str):
+def delete_gpu(gpu_name: str, db: DatabaseManager = Depends(get_db)):
     """Delete a GPU configuration."""
     try:
-        db = DatabaseManager()
         success = db.delete_gpu_config(gpu_name)
         if success:
-            return JSONResponse({"success": True, "message": f"GPU {gpu_name} deleted successfully"})
+            bump_gpu_configs_version()
+            return ORJSONResponse({"success": True, "message": f"GPU {gpu_name} deleted successfully"})
         else:
-            return JSONResponse({"success": False, "message": f"Failed to delete GPU {gpu_name}"})
+            return ORJSONResponse({"success": False, "message": f"Failed to delete GPU {gpu_name}"})
     except Exception as e:
-        return JSONResponse({"success": False, "message": f"Error deleting GPU: {str(e)}"})
+        return ORJSONResponse({"success": False, "message": f"Error deleting GPU: {str(e)}"})
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8001) 
\ No newline at end of file
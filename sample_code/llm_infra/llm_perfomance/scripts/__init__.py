@@ -0,0 +1 @@
+"""Shared settings, database access and maintenance scripts for the LLM calculators."""
@@ -11,12 +11,18 @@ This module provides database functionality for storing and managing:
 
 import sqlite3
 import json
+import queue
+import time
+from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+from dataclasses import dataclass, fields
 import os
 
-@dataclass
+import orjson
+
+@dataclass(slots=True)
 class GPUConfig:
     """GPU configuration data."""
     id: Optional[int] = None
@@ -34,7 +40,7 @@ class GPUConfig:
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class DeploymentConfig:
     """Deployment configuration data."""
     id: Optional[int] = None
@@ -56,8 +62,9 @@ class DeploymentConfig:
     is_active: bool = True
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
+    total_tps: int = 0  # Generated column (input_tps + output_tps), read-only
 
-@dataclass
+@dataclass(slots=True)
 class ModelConfig:
     """Model configuration data."""
     id: Optional[int] = None
@@ -81,24 +88,313 @@ class ModelConfig:
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
 
+_GPU_FIELDS = tuple(f.name for f in fields(GPUConfig))
+_MODEL_FIELDS = tuple(f.name for f in fields(ModelConfig))
+_DEPLOYMENT_FIELDS = tuple(f.name for f in fields(DeploymentConfig))
+
+# Explicit column lists in dataclass field order, so rows map positionally onto the dataclasses
+_GPU_COLS = ", ".join(_GPU_FIELDS)
+_MODEL_COLS = ", ".join(_MODEL_FIELDS)
+_DEPLOYMENT_COLS = ", ".join(_DEPLOYMENT_FIELDS)
+
+# Per-connection tuning; journal_mode=WAL is persistent and set once in init_database
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+# SQL statements are module constants so sqlite3 reuses its cached prepared statements
+INSERT_GPU_SQL = """
+    INSERT INTO gpu_configs (
+        name, gpu_type, vram_gb, cost_per_hour, cost_per_month,
+        power_watts, memory_bandwidth_gbps, fp16_performance_tflops,
+        fp8_performance_tflops, description, is_active
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_MODEL_SQL = """
+    INSERT INTO model_configs (
+        name, slug, parameters_b, context_window, precision,
+        typical_gpu, input_price_per_m, output_price_per_m,
+        tokens_per_gpu_tps, real_input_tps_per_gpu, real_output_tps_per_gpu,
+        openrouter_link, description, is_free, is_moe, is_awq, is_active
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_DEPLOYMENT_SQL = """
+    INSERT INTO deployment_configs (
+        name, gpu_config_id, gpu_count, gpu_cost_per_hour, model_name, input_tps,
+        output_tps, input_price_per_m, output_price_per_m, real_input_tps_per_gpu,
+        real_output_tps_per_gpu, profit_per_day, roi_percentage, notes, is_favorite, is_active
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SET_PREFERENCE_SQL = """
+    INSERT INTO user_preferences (key, value, description)
+    VALUES (?, ?, ?)
+    ON CONFLICT(key) DO UPDATE SET
+        value = excluded.value,
+        description = excluded.description,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+SELECT_GPU_ALL_SQL = f"SELECT {_GPU_COLS} FROM gpu_configs ORDER BY name"
+
+SELECT_GPU_ACTIVE_SQL = f"SELECT {_GPU_COLS} FROM gpu_configs WHERE is_active = 1 ORDER BY name"
+
+SELECT_GPU_BY_ID_SQL = f"SELECT {_GPU_COLS} FROM gpu_configs WHERE id = ?"
+
+SELECT_GPU_BY_NAME_SQL = f"SELECT {_GPU_COLS} FROM gpu_configs WHERE name = ? LIMIT 1"
+
+SELECT_GPU_ACTIVE_BY_NAME_SQL = f"SELECT {_GPU_COLS} FROM gpu_configs WHERE name = ? AND is_active = 1 LIMIT 1"
+
+UPDATE_GPU_SQL = """
+    UPDATE gpu_configs SET
+        name = ?, gpu_type = ?, vram_gb = ?, cost_per_hour = ?,
+        cost_per_month = ?, power_watts = ?, memory_bandwidth_gbps = ?,
+        fp16_performance_tflops = ?, fp8_performance_tflops = ?,
+        description = ?, is_active = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+UPDATE_GPU_COSTS_SQL = """
+    UPDATE gpu_configs SET
+        cost_per_hour = ?, cost_per_month = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+SELECT_MODEL_ALL_SQL = f"SELECT {_MODEL_COLS} FROM model_configs ORDER BY name"
+
+SELECT_MODEL_ACTIVE_SQL = f"SELECT {_MODEL_COLS} FROM model_configs WHERE is_active = 1 ORDER BY name"
+
+SELECT_MODEL_BY_NAME_SQL = f"SELECT {_MODEL_COLS} FROM model_configs WHERE name = ?"
+
+UPDATE_MODEL_SQL = """
+    UPDATE model_configs SET
+        slug = ?, parameters_b = ?, context_window = ?, precision = ?,
+        typical_gpu = ?, input_price_per_m = ?, output_price_per_m = ?,
+        tokens_per_gpu_tps = ?, real_input_tps_per_gpu = ?, real_output_tps_per_gpu = ?,
+        openrouter_link = ?, description = ?, is_free = ?, is_moe = ?, is_awq = ?, 
+        is_active = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+# Set-based pricing update: rows are staged in a per-connection temp table and
+# applied with one UPDATE ... FROM join on the model name
+CREATE_PRICING_STAGE_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS _tmp_pricing (
+        name TEXT PRIMARY KEY,
+        input_price_per_m REAL NOT NULL,
+        output_price_per_m REAL NOT NULL,
+        openrouter_link TEXT
+    )
+"""
+
+UPDATE_MODEL_PRICING_SQL = """
+    UPDATE model_configs SET
+        input_price_per_m = t.input_price_per_m,
+        output_price_per_m = t.output_price_per_m,
+        openrouter_link = COALESCE(t.openrouter_link, model_configs.openrouter_link),
+        updated_at = CURRENT_TIMESTAMP
+    FROM temp._tmp_pricing AS t
+    WHERE model_configs.name = t.name AND model_configs.is_active = 1
+    RETURNING model_configs.name
+"""
+
+# Keyed by (favorites_only, active_only)
+SELECT_DEPLOYMENT_SQL = {
+    (False, False): f"SELECT {_DEPLOYMENT_COLS} FROM deployment_configs ORDER BY created_at DESC",
+    (False, True): f"SELECT {_DEPLOYMENT_COLS} FROM deployment_configs WHERE is_active = 1 ORDER BY created_at DESC",
+    (True, False): f"SELECT {_DEPLOYMENT_COLS} FROM deployment_configs WHERE is_favorite = 1 ORDER BY created_at DESC",
+    (True, True): f"SELECT {_DEPLOYMENT_COLS} FROM deployment_configs WHERE is_favorite = 1 AND is_active = 1 ORDER BY created_at DESC",
+}
+
+UPDATE_DEPLOYMENT_SQL = """
+    UPDATE deployment_configs SET
+        name = ?, gpu_config_id = ?, gpu_count = ?, gpu_cost_per_hour = ?, model_name = ?,
+        input_tps = ?, output_tps = ?, input_price_per_m = ?,
+        output_price_per_m = ?, real_input_tps_per_gpu = ?, real_output_tps_per_gpu = ?,
+        profit_per_day = ?, roi_percentage = ?,
+        notes = ?, is_favorite = ?, is_active = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+INSERT_HISTORY_SQL = """
+    INSERT INTO calculation_history (
+        deployment_config_id, gpu_cost_per_hour, gpu_count,
+        input_tps, output_tps, input_price_per_m, output_price_per_m,
+        profit_per_day, roi_percentage
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SELECT_HISTORY_SQL = "SELECT * FROM calculation_history ORDER BY calculation_date DESC LIMIT ?"
+
+SELECT_DEPLOYMENT_DISPLAY_SQL = """
+    SELECT dc.name, gc.name
+    FROM deployment_configs dc
+    LEFT JOIN gpu_configs gc ON dc.gpu_config_id = gc.id
+    WHERE dc.id = ?
+"""
+
+SELECT_PREFERENCES_SQL = "SELECT key, value FROM user_preferences"
+
+DATA_TABLES = ("gpu_configs", "model_configs", "deployment_configs", "user_preferences", "calculation_history")
+
+TABLE_COUNTS_SQL = " UNION ALL ".join(f"SELECT '{table}', COUNT(*) FROM {table}" for table in DATA_TABLES)
+
+# How long get_database_info may reuse its row counts; they are informational only
+TABLE_COUNTS_TTL_SECONDS = 30.0
+
+# Row factories that build the config dataclasses straight from the SELECT_*_SQL column order
+def _gpu_factory(cursor: sqlite3.Cursor, row: tuple) -> GPUConfig:
+    return GPUConfig(*row)
+
+def _model_factory(cursor: sqlite3.Cursor, row: tuple) -> ModelConfig:
+    return ModelConfig(*row)
+
+def _deployment_factory(cursor: sqlite3.Cursor, row: tuple) -> DeploymentConfig:
+    return DeploymentConfig(*row)
+
+def _gpu_insert_row(gpu_config: GPUConfig) -> tuple:
+    """Parameters for INSERT_GPU_SQL."""
+    return (
+        gpu_config.name, gpu_config.gpu_type, gpu_config.vram_gb,
+        gpu_config.cost_per_hour, gpu_config.cost_per_month,
+        gpu_config.power_watts, gpu_config.memory_bandwidth_gbps,
+        gpu_config.fp16_performance_tflops, gpu_config.fp8_performance_tflops,
+        gpu_config.description, gpu_config.is_active
+    )
+
+def _model_insert_row(model_config: ModelConfig) -> tuple:
+    """Parameters for INSERT_MODEL_SQL."""
+    return (
+        model_config.name, model_config.slug, model_config.parameters_b,
+        model_config.context_window, model_config.precision,
+        model_config.typical_gpu, model_config.input_price_per_m,
+        model_config.output_price_per_m, model_config.tokens_per_gpu_tps,
+        model_config.real_input_tps_per_gpu, model_config.real_output_tps_per_gpu,
+        model_config.openrouter_link, model_config.description,
+        model_config.is_free, model_config.is_moe, model_config.is_awq,
+        model_config.is_active
+    )
+
+def _deployment_insert_row(deployment_config: DeploymentConfig) -> tuple:
+    """Parameters for INSERT_DEPLOYMENT_SQL."""
+    return (
+        deployment_config.name, deployment_config.gpu_config_id,
+        deployment_config.gpu_count, deployment_config.gpu_cost_per_hour,
+        deployment_config.model_name, deployment_config.input_tps, deployment_config.output_tps,
+        deployment_config.input_price_per_m, deployment_config.output_price_per_m,
+        deployment_config.real_input_tps_per_gpu, deployment_config.real_output_tps_per_gpu,
+        deployment_config.profit_per_day, deployment_config.roi_percentage,
+        deployment_config.notes, deployment_config.is_favorite,
+        deployment_config.is_active
+    )
+
+def _insert_batch(cursor: sqlite3.Cursor, insert_sql: str, rows: List[tuple],
+                  label: str, errors: List[str]) -> int:
+    """Insert rows with one executemany; if the batch fails, undo it and retry row by row.
+    
+    Returns the number of rows inserted; per-row failures are appended to errors.
+    """
+    cursor.execute("SAVEPOINT import_batch")
+    try:
+        cursor.executemany(insert_sql, rows)
+        return len(rows)
+    except sqlite3.Error:
+        cursor.execute("ROLLBACK TO import_batch")
+        inserted = 0
+        for row in rows:
+            try:
+                cursor.execute(insert_sql, row)
+                inserted += 1
+            except sqlite3.Error as e:
+                errors.append(f"{label} error: {e}")
+        return inserted
+    finally:
+        cursor.execute("RELEASE import_batch")
+
+class _ConnectionPool:
+    """Bounded pool of long-lived, pre-configured sqlite connections."""
+    
+    def __init__(self, db_path: str, size: int = 8):
+        self.db_path = db_path
+        self._idle: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=size)
+    
+    def _connect(self) -> sqlite3.Connection:
+        # Connections move between threadpool workers, but only one borrower uses each at a time
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+    
+    def release(self, conn: sqlite3.Connection):
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+    
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
 class DatabaseManager:
     """Database manager for LLM calculator data."""
     
     def __init__(self, db_path: str = "llm_calculator.db"):
         self.db_path = db_path
+        self._pool = _ConnectionPool(db_path)
+        # Per-instance so the cache dies with the manager; cleared whenever deployments or GPUs change
+        self._deployment_display = lru_cache(maxsize=512)(self._load_deployment_display)
+        # Whole user_preferences table, loaded on first read; writes through this manager keep it current
+        self._prefs: Optional[Dict[str, str]] = None
+        self._table_counts: Optional[Tuple[float, Dict[str, int]]] = None
         self.init_database()
     
-    def get_connection(self) -> sqlite3.Connection:
-        """Get database connection."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    @contextmanager
+    def get_connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled database connection; commits on success, rolls back on error."""
+        conn = self._pool.acquire()
+        changes = conn.total_changes
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            # Closing discards any open transaction; don't hand a broken connection back
+            conn.close()
+            raise
+        if conn.total_changes != changes:
+            # Rows were written; recount on the next get_database_info
+            self._table_counts = None
+        self._pool.release(conn)
+    
+    def close(self):
+        """Close all idle pooled connections."""
+        self._pool.close()
     
     def init_database(self):
         """Initialize database with tables."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
+            # Persistent settings stored in the database file. auto_vacuum only
+            # takes effect on a new database (before the first table is created).
+            cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            cursor.execute("PRAGMA journal_mode=WAL")
+            
             # GPU Configurations table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS gpu_configs (
@@ -167,10 +463,18 @@ class DatabaseManager:
                     is_active BOOLEAN DEFAULT 1,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    total_tps INTEGER GENERATED ALWAYS AS (input_tps + output_tps) VIRTUAL,
                     FOREIGN KEY (gpu_config_id) REFERENCES gpu_configs (id)
                 )
             """)
             
+            # Databases created before total_tps existed get it added in place; generated
+            # columns only show up in table_xinfo, not table_info
+            deployment_columns = {row[1] for row in cursor.execute("PRAGMA table_xinfo(deployment_configs)")}
+            if 'total_tps' not in deployment_columns:
+                cursor.execute("ALTER TABLE deployment_configs ADD COLUMN total_tps INTEGER "
+                               "GENERATED ALWAYS AS (input_tps + output_tps) VIRTUAL")
+            
             # User Preferences table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS user_preferences (
@@ -200,127 +504,112 @@ class DatabaseManager:
                     FOREIGN KEY (deployment_config_id) REFERENCES deployment_configs (id)
                 )
             """)
-            
+
+            # Indexes matching the WHERE / ORDER BY / JOIN columns of the read queries
+            cursor.executescript("""
+                CREATE INDEX IF NOT EXISTS idx_gpu_active_name ON gpu_configs(is_active, name);
+                CREATE INDEX IF NOT EXISTS idx_model_name ON model_configs(name);
+                CREATE INDEX IF NOT EXISTS idx_deploy_active_fav_created
+                    ON deployment_configs(is_active, is_favorite, created_at DESC);
+                CREATE INDEX IF NOT EXISTS idx_dc_profit ON deployment_configs(profit_per_day);
+                CREATE INDEX IF NOT EXISTS idx_dc_gpu_count ON deployment_configs(gpu_count);
+                CREATE INDEX IF NOT EXISTS idx_dc_roi ON deployment_configs(roi_percentage);
+                CREATE INDEX IF NOT EXISTS idx_dc_active_created ON deployment_configs(is_active, created_at);
+                CREATE INDEX IF NOT EXISTS idx_hist_date ON calculation_history(calculation_date DESC);
+                CREATE INDEX IF NOT EXISTS idx_hist_deploy ON calculation_history(deployment_config_id);
+            """)
+
             conn.commit()
     
     def insert_gpu_config(self, gpu_config: GPUConfig) -> int:
         """Insert a new GPU configuration."""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO gpu_configs (
-                    name, gpu_type, vram_gb, cost_per_hour, cost_per_month,
-                    power_watts, memory_bandwidth_gbps, fp16_performance_tflops,
-                    fp8_performance_tflops, description, is_active
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                gpu_config.name, gpu_config.gpu_type, gpu_config.vram_gb,
-                gpu_config.cost_per_hour, gpu_config.cost_per_month,
-                gpu_config.power_watts, gpu_config.memory_bandwidth_gbps,
-                gpu_config.fp16_performance_tflops, gpu_config.fp8_performance_tflops,
-                gpu_config.description, gpu_config.is_active
-            ))
-            return cursor.lastrowid
+            return self._insert_gpu_config_cursor(conn.cursor(), gpu_config)
+    
+    def _insert_gpu_config_cursor(self, cursor: sqlite3.Cursor, gpu_config: GPUConfig) -> int:
+        """Insert a new GPU configuration using an already-open cursor."""
+        cursor.execute(INSERT_GPU_SQL, _gpu_insert_row(gpu_config))
+        return cursor.lastrowid
     
     def get_gpu_configs(self, active_only: bool = True) -> List[GPUConfig]:
         """Get all GPU configurations."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            query = "SELECT * FROM gpu_configs"
-            if active_only:
-                query += " WHERE is_active = 1"
-            query += " ORDER BY name"
-            
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            return [GPUConfig(**dict(row)) for row in rows]
+            cursor.row_factory = _gpu_factory
+            cursor.execute(SELECT_GPU_ACTIVE_SQL if active_only else SELECT_GPU_ALL_SQL)
+            return cursor.fetchall()
     
     def get_gpu_config_by_id(self, gpu_id: int) -> Optional[GPUConfig]:
         """Get GPU configuration by ID."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM gpu_configs WHERE id = ?", (gpu_id,))
-            row = cursor.fetchone()
-            return GPUConfig(**dict(row)) if row else None
+            cursor.row_factory = _gpu_factory
+            cursor.execute(SELECT_GPU_BY_ID_SQL, (gpu_id,))
+            return cursor.fetchone()
+    
+    def get_gpu_config_by_name(self, name: str, active_only: bool = True) -> Optional[GPUConfig]:
+        """Get GPU configuration by name."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = _gpu_factory
+            cursor.execute(SELECT_GPU_ACTIVE_BY_NAME_SQL if active_only else SELECT_GPU_BY_NAME_SQL, (name,))
+            return cursor.fetchone()
     
     def update_gpu_config(self, gpu_config: GPUConfig) -> bool:
         """Update GPU configuration."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE gpu_configs SET
-                    name = ?, gpu_type = ?, vram_gb = ?, cost_per_hour = ?,
-                    cost_per_month = ?, power_watts = ?, memory_bandwidth_gbps = ?,
-                    fp16_performance_tflops = ?, fp8_performance_tflops = ?,
-                    description = ?, is_active = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (
+            cursor.execute(UPDATE_GPU_SQL, (
                 gpu_config.name, gpu_config.gpu_type, gpu_config.vram_gb,
                 gpu_config.cost_per_hour, gpu_config.cost_per_month,
                 gpu_config.power_watts, gpu_config.memory_bandwidth_gbps,
                 gpu_config.fp16_performance_tflops, gpu_config.fp8_performance_tflops,
                 gpu_config.description, gpu_config.is_active, gpu_config.id
             ))
-            return cursor.rowcount > 0
+            updated = cursor.rowcount > 0
+        self._deployment_display.cache_clear()
+        return updated
+    
+    def bulk_update_gpu_costs(self, rows: List[Tuple[float, float, int]]) -> int:
+        """Apply (cost_per_hour, cost_per_month, id) rows in one transaction; returns rows updated."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+            cursor.executemany(UPDATE_GPU_COSTS_SQL, rows)
+            return cursor.rowcount
     
     def insert_model_config(self, model_config: ModelConfig) -> int:
         """Insert a new model configuration."""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO model_configs (
-                    name, slug, parameters_b, context_window, precision,
-                    typical_gpu, input_price_per_m, output_price_per_m,
-                    tokens_per_gpu_tps, real_input_tps_per_gpu, real_output_tps_per_gpu,
-                    openrouter_link, description, is_free, is_moe, is_awq, is_active
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                model_config.name, model_config.slug, model_config.parameters_b,
-                model_config.context_window, model_config.precision,
-                model_config.typical_gpu, model_config.input_price_per_m,
-                model_config.output_price_per_m, model_config.tokens_per_gpu_tps,
-                model_config.real_input_tps_per_gpu, model_config.real_output_tps_per_gpu,
-                model_config.openrouter_link, model_config.description,
-                model_config.is_free, model_config.is_moe, model_config.is_awq,
-                model_config.is_active
-            ))
-            return cursor.lastrowid
+            return self._insert_model_config_cursor(conn.cursor(), model_config)
+    
+    def _insert_model_config_cursor(self, cursor: sqlite3.Cursor, model_config: ModelConfig) -> int:
+        """Insert a new model configuration using an already-open cursor."""
+        cursor.execute(INSERT_MODEL_SQL, _model_insert_row(model_config))
+        return cursor.lastrowid
     
     def get_model_configs(self, active_only: bool = True) -> List[ModelConfig]:
         """Get all model configurations."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            query = "SELECT * FROM model_configs"
-            if active_only:
-                query += " WHERE is_active = 1"
-            query += " ORDER BY name"
-            
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            return [ModelConfig(**dict(row)) for row in rows]
+            cursor.row_factory = _model_factory
+            cursor.execute(SELECT_MODEL_ACTIVE_SQL if active_only else SELECT_MODEL_ALL_SQL)
+            return cursor.fetchall()
     
     def get_model_config_by_name(self, name: str) -> Optional[ModelConfig]:
         """Get model configuration by name."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM model_configs WHERE name = ?", (name,))
-            row = cursor.fetchone()
-            return ModelConfig(**dict(row)) if row else None
+            cursor.row_factory = _model_factory
+            cursor.execute(SELECT_MODEL_BY_NAME_SQL, (name,))
+            return cursor.fetchone()
     
     def update_model_config(self, model_config: ModelConfig) -> bool:
         """Update model configuration."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    UPDATE model_configs SET
-                        slug = ?, parameters_b = ?, context_window = ?, precision = ?,
-                        typical_gpu = ?, input_price_per_m = ?, output_price_per_m = ?,
-                        tokens_per_gpu_tps = ?, real_input_tps_per_gpu = ?, real_output_tps_per_gpu = ?,
-                        openrouter_link = ?, description = ?, is_free = ?, is_moe = ?, is_awq = ?, 
-                        is_active = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (
+                cursor.execute(UPDATE_MODEL_SQL, (
                     model_config.slug, model_config.parameters_b, model_config.context_window,
                     model_config.precision, model_config.typical_gpu, model_config.input_price_per_m,
                     model_config.output_price_per_m, model_config.tokens_per_gpu_tps,
@@ -333,69 +622,109 @@ class DatabaseManager:
             print(f"Error updating model config: {e}")
             return False
     
+    def bulk_update_model_pricing(self, rows: List[Tuple]) -> List[str]:
+        """Apply (name, input_price_per_m, output_price_per_m[, openrouter_link]) rows in one transaction.
+        
+        Rows without a link keep the model's current openrouter_link. Returns the names
+        of the models that were updated.
+        """
+        staged = [(name, input_price, output_price, link[0] if link else None)
+                  for name, input_price, output_price, *link in rows]
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+            cursor.execute(CREATE_PRICING_STAGE_SQL)
+            cursor.execute("DELETE FROM temp._tmp_pricing")
+            cursor.executemany("INSERT OR REPLACE INTO temp._tmp_pricing VALUES (?, ?, ?, ?)", staged)
+            updated = [row[0] for row in cursor.execute(UPDATE_MODEL_PRICING_SQL)]
+            cursor.execute("DELETE FROM temp._tmp_pricing")
+            return updated
+    
     def insert_deployment_config(self, deployment_config: DeploymentConfig) -> int:
         """Insert a new deployment configuration."""
+        with self.get_connection() as conn:
+            deployment_id = self._insert_deployment_config_cursor(conn.cursor(), deployment_config)
+        self._deployment_display.cache_clear()
+        return deployment_id
+    
+    def _insert_deployment_config_cursor(self, cursor: sqlite3.Cursor, deployment_config: DeploymentConfig) -> int:
+        """Insert a new deployment configuration using an already-open cursor."""
+        cursor.execute(INSERT_DEPLOYMENT_SQL, _deployment_insert_row(deployment_config))
+        return cursor.lastrowid
+    
+    def get_deployment_configs(self, favorites_only: bool = False, active_only: bool = True,
+                               limit: Optional[int] = None, offset: int = 0) -> List[DeploymentConfig]:
+        """Get deployment configurations, newest first; limit/offset page through them."""
+        sql = SELECT_DEPLOYMENT_SQL[(favorites_only, active_only)]
+        params: Tuple = ()
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params = (limit, offset)
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO deployment_configs (
-                    name, gpu_config_id, gpu_count, gpu_cost_per_hour, model_name, input_tps,
-                    output_tps, input_price_per_m, output_price_per_m, real_input_tps_per_gpu,
-                    real_output_tps_per_gpu, profit_per_day, roi_percentage, notes, is_favorite, is_active
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                deployment_config.name, deployment_config.gpu_config_id,
-                deployment_config.gpu_count, deployment_config.gpu_cost_per_hour,
-                deployment_config.model_name, deployment_config.input_tps, deployment_config.output_tps,
-                deployment_config.input_price_per_m, deployment_config.output_price_per_m,
-                deployment_config.real_input_tps_per_gpu, deployment_config.real_output_tps_per_gpu,
-                deployment_config.profit_per_day, deployment_config.roi_percentage,
-                deployment_config.notes, deployment_config.is_favorite,
-                deployment_config.is_active
-            ))
-            return cursor.lastrowid
+            cursor.row_factory = _deployment_factory
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+    
+    @staticmethod
+    def _deployment_filters(min_profit: Optional[float] = None, gpu_count: Optional[int] = None,
+                            model_like: Optional[str] = None, max_roi: Optional[float] = None,
+                            profitable: Optional[bool] = None,
+                            older_than_days: Optional[int] = None) -> Tuple[str, List[Any]]:
+        """WHERE clause and parameters shared by search_ and delete_deployment_configs."""
+        conditions = ["is_active = 1"]
+        params: List[Any] = []
+        if min_profit is not None:
+            conditions.append("profit_per_day >= ?")
+            params.append(min_profit)
+        if gpu_count is not None:
+            conditions.append("gpu_count = ?")
+            params.append(gpu_count)
+        if model_like is not None:
+            conditions.append("model_name LIKE ? ESCAPE '\\'")
+            escaped = model_like.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        if max_roi is not None:
+            conditions.append("roi_percentage < ?")
+            params.append(max_roi)
+        if profitable is not None:
+            conditions.append("profit_per_day > 0" if profitable else "profit_per_day <= 0")
+        if older_than_days is not None:
+            # created_at is SQLite's UTC "YYYY-MM-DD HH:MM:SS" text, which orders the same as time
+            conditions.append("created_at < datetime('now', ?)")
+            params.append(f"-{int(older_than_days)} days")
+        return " AND ".join(conditions), params
     
-    def get_deployment_configs(self, favorites_only: bool = False, active_only: bool = True) -> List[DeploymentConfig]:
-        """Get deployment configurations."""
+    def search_deployment_configs(self, **filters) -> List[DeploymentConfig]:
+        """Get active deployment configurations matching every given filter.
+        
+        Filters: min_profit, gpu_count, model_like (case-insensitive substring of model_name),
+        max_roi (exclusive), profitable, older_than_days.
+        """
+        where, params = self._deployment_filters(**filters)
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            query = "SELECT * FROM deployment_configs"
-            conditions = []
-            
-            if favorites_only:
-                conditions.append("is_favorite = 1")
-            
-            if active_only:
-                conditions.append("is_active = 1")
-            
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
-            
-            query += " ORDER BY created_at DESC"
-            
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            configs = []
-            for row in rows:
-                config = DeploymentConfig(**dict(row))
-                print(f"Debug: Loaded config {config.id}, gpu_cost_per_hour: {config.gpu_cost_per_hour}")  # Debug log
-                configs.append(config)
-            return configs
+            cursor.row_factory = _deployment_factory
+            cursor.execute(f"SELECT {_DEPLOYMENT_COLS} FROM deployment_configs WHERE {where} "
+                           "ORDER BY created_at DESC", params)
+            return cursor.fetchall()
+    
+    def delete_deployment_configs(self, **filters) -> int:
+        """Delete the active deployment configurations search_deployment_configs would return; returns rows deleted."""
+        if all(value is None for value in filters.values()):
+            raise ValueError("delete_deployment_configs needs at least one filter")
+        where, params = self._deployment_filters(**filters)
+        with self.get_connection() as conn:
+            deleted = conn.execute(f"DELETE FROM deployment_configs WHERE {where}", params).rowcount
+        self._deployment_display.cache_clear()
+        return deleted
     
     def update_deployment_config(self, deployment_config: DeploymentConfig) -> bool:
         """Update deployment configuration."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    UPDATE deployment_configs SET
-                        name = ?, gpu_config_id = ?, gpu_count = ?, gpu_cost_per_hour = ?, model_name = ?,
-                        input_tps = ?, output_tps = ?, input_price_per_m = ?,
-                        output_price_per_m = ?, real_input_tps_per_gpu = ?, real_output_tps_per_gpu = ?,
-                        profit_per_day = ?, roi_percentage = ?,
-                        notes = ?, is_favorite = ?, is_active = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (
+                cursor.execute(UPDATE_DEPLOYMENT_SQL, (
                     deployment_config.name, deployment_config.gpu_config_id,
                     deployment_config.gpu_count, deployment_config.gpu_cost_per_hour,
                     deployment_config.model_name, deployment_config.input_tps, deployment_config.output_tps,
@@ -405,7 +734,9 @@ class DatabaseManager:
                     deployment_config.notes, deployment_config.is_favorite,
                     deployment_config.is_active, deployment_config.id
                 ))
-                return cursor.rowcount > 0
+                updated = cursor.rowcount > 0
+            self._deployment_display.cache_clear()
+            return updated
         except Exception as e:
             print(f"Error updating deployment config: {e}")
             return False
@@ -418,13 +749,7 @@ class DatabaseManager:
         """Save calculation to history."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO calculation_history (
-                    deployment_config_id, gpu_cost_per_hour, gpu_count,
-                    input_tps, output_tps, input_price_per_m, output_price_per_m,
-                    profit_per_day, roi_percentage
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            cursor.execute(INSERT_HISTORY_SQL, (
                 deployment_config_id, gpu_cost_per_hour, gpu_count,
                 input_tps, output_tps, input_price_per_m, output_price_per_m,
                 profit_per_day, roi_percentage
@@ -432,35 +757,47 @@ class DatabaseManager:
     
     def get_calculation_history(self, limit: int = 50) -> List[Dict]:
         """Get recent calculation history."""
+        return list(self.iter_calculation_history(limit))
+    
+    def iter_calculation_history(self, limit: int = 50) -> Iterator[Dict]:
+        """Yield recent calculation history rows as they are read.
+        
+        The pooled connection stays checked out until the generator is exhausted or closed.
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT ch.*, dc.name as deployment_name, gc.name as gpu_name
-                FROM calculation_history ch
-                LEFT JOIN deployment_configs dc ON ch.deployment_config_id = dc.id
-                LEFT JOIN gpu_configs gc ON dc.gpu_config_id = gc.id
-                ORDER BY ch.calculation_date DESC
-                LIMIT ?
-            """, (limit,))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            cursor.execute(SELECT_HISTORY_SQL, (limit,))
+            for row in cursor:
+                entry = dict(row)
+                entry["deployment_name"], entry["gpu_name"] = self._deployment_display(entry["deployment_config_id"])
+                yield entry
+    
+    def _load_deployment_display(self, deployment_id: Optional[int]) -> Tuple[Optional[str], Optional[str]]:
+        """Look up (deployment name, GPU name) for a history row; cached via _deployment_display."""
+        if deployment_id is None:
+            return None, None
+        with self.get_connection() as conn:
+            row = conn.execute(SELECT_DEPLOYMENT_DISPLAY_SQL, (deployment_id,)).fetchone()
+        return (row[0], row[1]) if row else (None, None)
     
     def set_user_preference(self, key: str, value: str, description: str = ""):
         """Set user preference."""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT OR REPLACE INTO user_preferences (key, value, description, updated_at)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-            """, (key, value, description))
+            self._set_user_preference_cursor(conn.cursor(), key, value, description)
+        if self._prefs is not None:
+            self._prefs[key] = value
+    
+    def _set_user_preference_cursor(self, cursor: sqlite3.Cursor, key: str, value: str, description: str = ""):
+        """Set user preference using an already-open cursor."""
+        cursor.execute(SET_PREFERENCE_SQL, (key, value, description))
     
     def get_user_preference(self, key: str, default: str = "") -> str:
         """Get user preference."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT value FROM user_preferences WHERE key = ?", (key,))
-            row = cursor.fetchone()
-            return row['value'] if row else default
+        prefs = self._prefs
+        if prefs is None:
+            with self.get_connection() as conn:
+                prefs = self._prefs = dict(conn.execute(SELECT_PREFERENCES_SQL).fetchall())
+        return prefs.get(key, default)
     
     def populate_default_data(self):
         """Populate database with default GPU configurations."""
@@ -515,19 +852,22 @@ class DatabaseManager:
             )
         ]
         
-        for gpu in default_gpus:
-            self.insert_gpu_config(gpu)
-        
-        # Set default preferences
-        self.set_user_preference("default_gpu_cost", "2.0", "Default GPU cost per hour")
-        self.set_user_preference("default_gpu_count", "8", "Default number of GPUs")
-        self.set_user_preference("currency", "USD", "Preferred currency")
+        # One transaction for all default rows instead of a commit per insert
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+            cursor.executemany(INSERT_GPU_SQL, [_gpu_insert_row(gpu) for gpu in default_gpus])
+            
+            # Set default preferences
+            cursor.executemany(SET_PREFERENCE_SQL, [
+                ("default_gpu_cost", "2.0", "Default GPU cost per hour"),
+                ("default_gpu_count", "8", "Default number of GPUs"),
+                ("currency", "USD", "Preferred currency"),
+            ])
+        self._prefs = None
 
     def get_database_info(self) -> Dict[str, Any]:
         """Get database file information."""
-        import os
-        import sqlite3
-        
         db_info = {
             "file_path": self.db_path,
             "file_size": 0,
@@ -536,63 +876,73 @@ class DatabaseManager:
             "last_modified": None
         }
         
-        if os.path.exists(self.db_path):
-            db_info["exists"] = True
-            db_info["file_size"] = os.path.getsize(self.db_path)
-            db_info["last_modified"] = os.path.getmtime(self.db_path)
-            
-            # Get table counts
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                tables = ["gpu_configs", "model_configs", "deployment_configs", "user_preferences", "calculation_history"]
-                for table in tables:
-                    try:
-                        cursor.execute(f"SELECT COUNT(*) as count FROM {table}")
-                        result = cursor.fetchone()
-                        db_info["table_counts"][table] = result['count'] if result else 0
-                    except sqlite3.OperationalError:
-                        db_info["table_counts"][table] = 0
+        try:
+            st = os.stat(self.db_path)
+        except FileNotFoundError:
+            return db_info
+        
+        db_info.update(exists=True, file_size=st.st_size, last_modified=st.st_mtime)
         
+        db_info["table_counts"] = dict(self._get_table_counts())
         return db_info
     
-    def export_configurations_to_json(self, file_path: str = "configurations_backup.json") -> bool:
-        """Export all configurations to a JSON file."""
+    def _get_table_counts(self) -> Dict[str, int]:
+        """Row count per table, recounted at most once per TABLE_COUNTS_TTL_SECONDS."""
+        now = time.monotonic()
+        if self._table_counts is not None and now - self._table_counts[0] < TABLE_COUNTS_TTL_SECONDS:
+            return self._table_counts[1]
+        
+        with self.get_connection() as conn:
+            try:
+                counts = dict(conn.execute(TABLE_COUNTS_SQL).fetchall())
+            except sqlite3.OperationalError:
+                counts = dict.fromkeys(DATA_TABLES, 0)
+        self._table_counts = (now, counts)
+        return counts
+    
+    def export_configurations_to_json(self, file_path: str = "configurations_backup.json") -> Optional[Dict[str, int]]:
+        """Export all configurations to a JSON file.
+        
+        Rows are streamed from the cursor and written one per line as they are read, so
+        memory use does not grow with table size. Returns the number of rows written per
+        section, or None if the export failed.
+        """
         try:
-            import json
-            from datetime import datetime
-            
-            # Get all data
-            gpu_configs = self.get_gpu_configs(active_only=False)
-            model_configs = self.get_model_configs(active_only=False)
-            deployment_configs = self.get_deployment_configs(favorites_only=False)
-            user_preferences = []
-            
-            # Get user preferences
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM user_preferences")
-                rows = cursor.fetchall()
-                user_preferences = [dict(row) for row in rows]
-            
-            # Prepare export data
-            export_data = {
-                "export_date": datetime.now().isoformat(),
-                "database_info": self.get_database_info(),
-                "gpu_configs": [asdict(gpu) for gpu in gpu_configs],
-                "model_configs": [asdict(model) for model in model_configs],
-                "deployment_configs": [asdict(deployment) for deployment in deployment_configs],
-                "user_preferences": user_preferences
-            }
+            # Same row sets and field order as the get_*_configs methods return
+            sections = (
+                ("gpu_configs", self._iter_dicts(SELECT_GPU_ALL_SQL)),
+                ("model_configs", self._iter_dicts(SELECT_MODEL_ALL_SQL)),
+                ("deployment_configs", self._iter_dicts(SELECT_DEPLOYMENT_SQL[(False, True)])),
+                ("user_preferences", self._iter_dicts("SELECT * FROM user_preferences")),
+            )
             
-            # Write to JSON file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False, default=str)
+            counts = {}
+            with open(file_path, 'wb') as f:
+                f.write(b'{"export_date": ' + orjson.dumps(datetime.now().isoformat()))
+                f.write(b',\n"database_info": ' + orjson.dumps(self.get_database_info(), default=str))
+                for name, rows in sections:
+                    f.write(b',\n"' + name.encode() + b'": [')
+                    separator = b'\n'
+                    count = 0
+                    for row in rows:
+                        f.write(separator + orjson.dumps(row, default=str))
+                        separator = b',\n'
+                        count += 1
+                    f.write(b'\n]')
+                    counts[name] = count
+                f.write(b'\n}\n')
             
-            return True
+            return counts
             
         except Exception as e:
             print(f"Error exporting configurations: {e}")
-            return False
+            return None
+    
+    def _iter_dicts(self, sql: str) -> Iterator[Dict]:
+        """Yield the rows of a query as dictionaries while the cursor is read."""
+        with self.get_connection() as conn:
+            for row in conn.execute(sql):
+                yield dict(row)
     
     def import_configurations_from_json(self, file_path: str) -> Dict[str, Any]:
         """Import configurations from a JSON file."""
@@ -613,48 +963,44 @@ class DatabaseManager:
                 "errors": []
             }
             
-            # Import GPU configurations
-            if "gpu_configs" in import_data:
-                for gpu_data in import_data["gpu_configs"]:
-                    try:
-                        gpu_config = GPUConfig(**gpu_data)
-                        self.insert_gpu_config(gpu_config)
-                        results["imported"]["gpu_configs"] += 1
-                    except Exception as e:
-                        results["errors"].append(f"GPU config error: {e}")
-            
-            # Import model configurations
-            if "model_configs" in import_data:
-                for model_data in import_data["model_configs"]:
-                    try:
-                        model_config = ModelConfig(**model_data)
-                        self.insert_model_config(model_config)
-                        results["imported"]["model_configs"] += 1
-                    except Exception as e:
-                        results["errors"].append(f"Model config error: {e}")
-            
-            # Import deployment configurations
-            if "deployment_configs" in import_data:
-                for deployment_data in import_data["deployment_configs"]:
-                    try:
-                        deployment_config = DeploymentConfig(**deployment_data)
-                        self.insert_deployment_config(deployment_config)
-                        results["imported"]["deployment_configs"] += 1
-                    except Exception as e:
-                        results["errors"].append(f"Deployment config error: {e}")
+            # Import everything in a single transaction
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN")
+                
+                # Build each table's parameter rows first (per-row errors), then insert
+                # them with one executemany per table, falling back to row-by-row on failure
+                sections = (
+                    ("gpu_configs", "GPU config", GPUConfig, INSERT_GPU_SQL, _gpu_insert_row),
+                    ("model_configs", "Model config", ModelConfig, INSERT_MODEL_SQL, _model_insert_row),
+                    ("deployment_configs", "Deployment config", DeploymentConfig,
+                     INSERT_DEPLOYMENT_SQL, _deployment_insert_row),
+                )
+                for section, label, config_cls, insert_sql, to_row in sections:
+                    if section not in import_data:
+                        continue
+                    rows = []
+                    for config_data in import_data[section]:
+                        try:
+                            rows.append(to_row(config_cls(**config_data)))
+                        except Exception as e:
+                            results["errors"].append(f"{label} error: {e}")
+                    results["imported"][section] += _insert_batch(
+                        cursor, insert_sql, rows, label, results["errors"])
+                
+                # Import user preferences
+                if "user_preferences" in import_data:
+                    rows = []
+                    for pref_data in import_data["user_preferences"]:
+                        try:
+                            rows.append((pref_data["key"], pref_data["value"], pref_data.get("description", "")))
+                        except Exception as e:
+                            results["errors"].append(f"User preference error: {e}")
+                    results["imported"]["user_preferences"] += _insert_batch(
+                        cursor, SET_PREFERENCE_SQL, rows, "User preference", results["errors"])
             
-            # Import user preferences
-            if "user_preferences" in import_data:
-                for pref_data in import_data["user_preferences"]:
-                    try:
-                        self.set_user_preference(
-                            pref_data["key"],
-                            pref_data["value"],
-                            pref_data.get("description", "")
-                        )
-                        results["imported"]["user_preferences"] += 1
-                    except Exception as e:
-                        results["errors"].append(f"User preference error: {e}")
+            self._deployment_display.cache_clear()
+            self._prefs = None
             
             if results["errors"]:
                 results["success"] = False
@@ -669,17 +1015,22 @@ class DatabaseManager:
             }
     
     def backup_database(self, backup_path: str = None) -> str:
-        """Create a backup of the database file."""
-        import shutil
-        import os
-        from datetime import datetime
+        """Create a consistent backup of the database using SQLite's online backup API.
         
+        Pages are copied in chunks, so concurrent writers are not blocked for the whole copy
+        and committed WAL contents are included.
+        """
         if backup_path is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_path = f"llm_calculator_backup_{timestamp}.db"
         
         try:
-            shutil.copy2(self.db_path, backup_path)
+            dst = sqlite3.connect(backup_path)
+            try:
+                with self.get_connection() as src:
+                    src.backup(dst, pages=1024)
+            finally:
+                dst.close()
             return backup_path
         except Exception as e:
             print(f"Error creating backup: {e}")
@@ -715,7 +1066,7 @@ class DatabaseManager:
                     GROUP BY gpu_count 
                     ORDER BY gpu_count
                 """)
-                gpu_stats = [dict(row) for row in cursor.fetchall()]
+                gpu_stats = [dict(row) for row in cursor]
                 
                 return {
                     "total_configurations": stats["total_configs"],
@@ -732,9 +1083,13 @@ class DatabaseManager:
             print(f"Error getting configuration stats: {e}")
             return {}
 
-# Global database instance
-db = DatabaseManager()
+# Global database instance, created on first use so importing this module never opens
+# (and switches to WAL) the database file
+db: Optional[DatabaseManager] = None
 
 def get_db() -> DatabaseManager:
     """Get database instance."""
+    global db
+    if db is None:
+        db = DatabaseManager()
     return db 
\ No newline at end of file
@@ -18,9 +18,11 @@ Commands:
     stats         - Show configuration statistics
     export        - Export configurations to JSON
     backup        - Create database backup
-    list          - List all saved configurations
+    list          - List saved configurations (first 50; --all for every one)
     search        - Search configurations by criteria
-    clean         - Clean up old configurations
+                    [--profitable | --unprofitable] [--gpu-count N] [--model TEXT] [--min-profit X]
+    clean         - Clean up old configurations (lists matches; add --yes to apply)
+                    --unprofitable | --older-than-days N | --min-roi PERCENT
 """
 
 import sys
@@ -68,18 +70,17 @@ def export_configurations():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     file_path = f"configurations_export_{timestamp}.json"
     
-    success = db.export_configurations_to_json(file_path)
+    counts = db.export_configurations_to_json(file_path)
     
-    if success:
+    if counts is not None:
         print(f"✅ Configurations exported to: {file_path}")
         
-        # Show export summary
-        info = db.get_database_info()
+        # Show export summary from the rows actually written
         print(f"📊 Export Summary:")
-        print(f"   GPU Configurations: {info['table_counts'].get('gpu_configs', 0)}")
-        print(f"   Model Configurations: {info['table_counts'].get('model_configs', 0)}")
-        print(f"   Deployment Configurations: {info['table_counts'].get('deployment_configs', 0)}")
-        print(f"   User Preferences: {info['table_counts'].get('user_preferences', 0)}")
+        print(f"   GPU Configurations: {counts['gpu_configs']}")
+        print(f"   Model Configurations: {counts['model_configs']}")
+        print(f"   Deployment Configurations: {counts['deployment_configs']}")
+        print(f"   User Preferences: {counts['user_preferences']}")
     else:
         print("❌ Failed to export configurations")
 
@@ -98,10 +99,14 @@ def create_backup():
     else:
         print("❌ Failed to create backup")
 
-def list_configurations():
-    """List all saved configurations."""
+def list_configurations(limit=50):
+    """List saved configurations, newest first; limit=None lists all of them."""
     db = DatabaseManager()
-    configs = db.get_deployment_configs()
+    # Fetch one extra row to know whether there is more than one page
+    configs = db.get_deployment_configs(limit=None if limit is None else limit + 1)
+    truncated = limit is not None and len(configs) > limit
+    if truncated:
+        configs = configs[:limit]
     
     print("=== Saved Configurations ===")
     if not configs:
@@ -112,50 +117,35 @@ def list_configurations():
         print(f"\n{i}. {config.name}")
         print(f"   GPU Count: {config.gpu_count}")
         print(f"   Model: {config.model_name}")
-        print(f"   TPS: {config.input_tps + config.output_tps:,}")
+        print(f"   TPS: {config.total_tps:,}")
         print(f"   Daily Profit: ${config.profit_per_day:,.2f}")
         print(f"   ROI: {config.roi_percentage:.1f}%")
         print(f"   Created: {config.created_at}")
         if config.notes:
             print(f"   Notes: {config.notes}")
+    
+    if truncated:
+        print(f"\nShowing the {limit} newest configurations; re-run with --all to list every one")
 
-def search_configurations():
-    """Search configurations by criteria."""
+def search_configurations(profitable=None, gpu_count=None, model=None, min_profit=None):
+    """Search configurations by criteria; all given criteria must match."""
     db = DatabaseManager()
-    configs = db.get_deployment_configs()
-    
-    print("=== Search Configurations ===")
-    print("Available search criteria:")
-    print("1. By profitability (profitable/unprofitable)")
-    print("2. By GPU count")
-    print("3. By model name")
-    print("4. By minimum profit")
+    filtered = db.search_deployment_configs(
+        min_profit=min_profit, gpu_count=gpu_count, model_like=model, profitable=profitable
+    )
     
-    choice = input("\nEnter search choice (1-4): ").strip()
+    criteria = []
+    if profitable is not None:
+        criteria.append("profitable" if profitable else "unprofitable")
+    if gpu_count is not None:
+        criteria.append(f"{gpu_count} GPUs")
+    if model is not None:
+        criteria.append(f"model matching '{model}'")
+    if min_profit is not None:
+        criteria.append(f"profit >= ${min_profit:,.2f}")
     
-    if choice == "1":
-        profitable = input("Show profitable configs? (y/n): ").lower() == 'y'
-        filtered = [c for c in configs if (c.profit_per_day > 0) == profitable]
-        print(f"\nFound {len(filtered)} {'profitable' if profitable else 'unprofitable'} configurations:")
-        
-    elif choice == "2":
-        gpu_count = int(input("Enter GPU count: "))
-        filtered = [c for c in configs if c.gpu_count == gpu_count]
-        print(f"\nFound {len(filtered)} configurations with {gpu_count} GPUs:")
-        
-    elif choice == "3":
-        model_name = input("Enter model name (partial match): ").lower()
-        filtered = [c for c in configs if model_name in c.model_name.lower()]
-        print(f"\nFound {len(filtered)} configurations matching '{model_name}':")
-        
-    elif choice == "4":
-        min_profit = float(input("Enter minimum daily profit: "))
-        filtered = [c for c in configs if c.profit_per_day >= min_profit]
-        print(f"\nFound {len(filtered)} configurations with profit >= ${min_profit:,.2f}:")
-        
-    else:
-        print("Invalid choice")
-        return
+    print("=== Search Configurations ===")
+    print(f"Found {len(filtered)} configurations" + (f" ({', '.join(criteria)})" if criteria else "") + ":")
     
     # Display results
     for i, config in enumerate(filtered, 1):
@@ -165,91 +155,82 @@ def search_configurations():
         print(f"   GPU Count: {config.gpu_count}")
         print(f"   Model: {config.model_name}")
 
-def clean_configurations():
-    """Clean up old or unprofitable configurations."""
+def clean_configurations(unprofitable=False, older_than_days=None, min_roi=None, yes=False):
+    """Clean up old or unprofitable configurations; only lists matches unless yes is set."""
     db = DatabaseManager()
-    configs = db.get_deployment_configs()
     
     print("=== Clean Configurations ===")
-    print("1. Delete unprofitable configurations")
-    print("2. Delete configurations older than X days")
-    print("3. Delete configurations with low ROI")
-    
-    choice = input("\nEnter choice (1-3): ").strip()
     
-    if choice == "1":
-        unprofitable = [c for c in configs if c.profit_per_day <= 0]
-        if unprofitable:
-            print(f"\nFound {len(unprofitable)} unprofitable configurations:")
-            for config in unprofitable:
+    if unprofitable:
+        matches = db.search_deployment_configs(profitable=False)
+        if matches:
+            print(f"\nFound {len(matches)} unprofitable configurations:")
+            for config in matches:
                 print(f"  - {config.name}: ${config.profit_per_day:,.2f}")
             
-            confirm = input("\nDelete these configurations? (y/n): ").lower() == 'y'
-            if confirm:
-                deleted = 0
-                for config in unprofitable:
-                    config.is_favorite = False  # Mark as inactive
-                    if db.update_deployment_config(config):
-                        deleted += 1
+            if yes:
+                deleted = db.delete_deployment_configs(profitable=False)
                 print(f"✅ Deleted {deleted} configurations")
         else:
             print("No unprofitable configurations found")
     
-    elif choice == "2":
-        days = int(input("Delete configurations older than how many days? "))
-        cutoff_date = datetime.now().timestamp() - (days * 24 * 3600)
-        
-        old_configs = []
-        for config in configs:
-            if config.created_at:
-                try:
-                    created_timestamp = datetime.fromisoformat(config.created_at.replace('Z', '+00:00')).timestamp()
-                    if created_timestamp < cutoff_date:
-                        old_configs.append(config)
-                except:
-                    pass
-        
-        if old_configs:
-            print(f"\nFound {len(old_configs)} configurations older than {days} days:")
-            for config in old_configs:
+    elif older_than_days is not None:
+        matches = db.search_deployment_configs(older_than_days=older_than_days)
+        if matches:
+            print(f"\nFound {len(matches)} configurations older than {older_than_days} days:")
+            for config in matches:
                 print(f"  - {config.name}: {config.created_at}")
             
-            confirm = input("\nDelete these configurations? (y/n): ").lower() == 'y'
-            if confirm:
-                deleted = 0
-                for config in old_configs:
-                    config.is_favorite = False
-                    if db.update_deployment_config(config):
-                        deleted += 1
+            if yes:
+                deleted = db.delete_deployment_configs(older_than_days=older_than_days)
                 print(f"✅ Deleted {deleted} configurations")
         else:
-            print(f"No configurations older than {days} days found")
+            print(f"No configurations older than {older_than_days} days found")
     
-    elif choice == "3":
-        min_roi = float(input("Delete configurations with ROI below: "))
-        low_roi_configs = [c for c in configs if c.roi_percentage < min_roi]
-        
-        if low_roi_configs:
-            print(f"\nFound {len(low_roi_configs)} configurations with ROI < {min_roi}%:")
-            for config in low_roi_configs:
+    elif min_roi is not None:
+        matches = db.search_deployment_configs(max_roi=min_roi)
+        if matches:
+            print(f"\nFound {len(matches)} configurations with ROI < {min_roi}%:")
+            for config in matches:
                 print(f"  - {config.name}: {config.roi_percentage:.1f}%")
             
-            confirm = input("\nDelete these configurations? (y/n): ").lower() == 'y'
-            if confirm:
-                deleted = 0
-                for config in low_roi_configs:
-                    config.is_favorite = False
-                    if db.update_deployment_config(config):
-                        deleted += 1
+            if yes:
+                deleted = db.delete_deployment_configs(max_roi=min_roi)
                 print(f"✅ Deleted {deleted} configurations")
         else:
             print(f"No configurations with ROI < {min_roi}% found")
+    
+    if not yes and matches:
+        print("\nRe-run with --yes to delete these configurations")
 
 def main():
     """Main function."""
     parser = argparse.ArgumentParser(description="Database Manager for LLM Calculator")
-    parser.add_argument("command", choices=["info", "stats", "export", "backup", "list", "search", "clean"],
-                       help="Command to execute")
+    subparsers = parser.add_subparsers(dest="command", required=True, help="Command to execute")
+    
+    subparsers.add_parser("info", help="Show database information")
+    subparsers.add_parser("stats", help="Show configuration statistics")
+    subparsers.add_parser("export", help="Export configurations to JSON")
+    subparsers.add_parser("backup", help="Create database backup")
+    list_parser = subparsers.add_parser("list", help="List saved configurations")
+    list_parser.add_argument("--all", action="store_true", help="List every configuration instead of the newest 50")
+    
+    search = subparsers.add_parser("search", help="Search configurations by criteria")
+    profit_group = search.add_mutually_exclusive_group()
+    profit_group.add_argument("--profitable", dest="profitable", action="store_const", const=True,
+                              help="Only profitable configurations")
+    profit_group.add_argument("--unprofitable", dest="profitable", action="store_const", const=False,
+                              help="Only unprofitable configurations")
+    search.add_argument("--gpu-count", type=int, help="Exact GPU count")
+    search.add_argument("--model", help="Model name (partial, case-insensitive match)")
+    search.add_argument("--min-profit", type=float, help="Minimum daily profit")
+    
+    clean = subparsers.add_parser("clean", help="Clean up old or unprofitable configurations")
+    criterion = clean.add_mutually_exclusive_group(required=True)
+    criterion.add_argument("--unprofitable", action="store_true", help="Configurations with profit <= 0")
+    criterion.add_argument("--older-than-days", type=int, metavar="DAYS", help="Configurations older than DAYS")
+    criterion.add_argument("--min-roi", type=float, metavar="PERCENT", help="Configurations with ROI below PERCENT")
+    clean.add_argument("--yes", action="store_true", help="Apply the cleanup instead of only listing matches")
     
     args = parser.parse_args()
     
@@ -263,11 +244,11 @@ def main():
         elif args.command == "backup":
             create_backup()
         elif args.command == "list":
-            list_configurations()
+            list_configurations(limit=None if args.all else 50)
         elif args.command == "search":
-            search_configurations()
+            search_configurations(args.profitable, args.gpu_count, args.model, args.min_profit)
         elif args.command == "clean":
-            clean_configurations()
+            clean_configurations(args.unprofitable, args.older_than_days, args.min_roi, args.yes)
     
     except KeyboardInterrupt:
         print("\n\nOperation cancelled by user")
@@ -278,4 +259,4 @@ if __name__ == "__main__":
     if len(sys.argv) == 1:
         print(__doc__)
         sys.exit(1)
-    main() 
\ No newline at end of file
+    main()
@@ -7,112 +7,125 @@ This script reads the Excel file and converts it to ModelConfig objects
 that can be integrated into the model_settings.py file.
 """
 
+import numpy as np
 import pandas as pd
-from model_settings import ModelConfig, ALL_MODELS
+from model_settings import ModelConfig, ALL_MODELS, _DEFAULT_INPUT_PRICE, _DEFAULT_OUTPUT_PRICE
 import re
 
+# The helpers below work on whole columns; create_model_config only assembles the results
+
+_TIER_EMOJI_RE = re.compile(r'[🥇🥈🥉]')
+_PARAM_RE = re.compile(r'(\d+)B', re.IGNORECASE)
+
+# Tier level keywords, checked in order; the first match wins
+_TIER_KEYWORDS = {
+    "Free/Entry": re.compile('免费|入门'),
+    "Standard": re.compile('中端|标准'),
+    "Premium": re.compile('高端|专业'),
+    "Enterprise": re.compile('顶级|企业'),
+}
+
 def clean_tier_name(tier):
-    """Clean tier name by removing emojis and extracting key info."""
-    # Remove emojis and extract tier info
-    tier_clean = re.sub(r'[🥇🥈🥉]', '', tier)
-    tier_clean = tier_clean.strip()
-    
-    # Extract tier level
-    if '免费' in tier_clean or '入门' in tier_clean:
-        return "Free/Entry"
-    elif '中端' in tier_clean or '标准' in tier_clean:
-        return "Standard"
-    elif '高端' in tier_clean or '专业' in tier_clean:
-        return "Premium"
-    elif '顶级' in tier_clean or '企业' in tier_clean:
-        return "Enterprise"
-    else:
-        return tier_clean
+    """Clean tier names by removing emojis and extracting key info."""
+    tier_clean = tier.str.replace(_TIER_EMOJI_RE, '', regex=True).str.strip()
+    return pd.Series(np.select(
+        [tier_clean.str.contains(pattern) for pattern in _TIER_KEYWORDS.values()],
+        list(_TIER_KEYWORDS),
+        default=tier_clean,
+    ), index=tier.index)
 
 def extract_parameters(model_name):
-    """Extract parameter count from model name."""
+    """Extract parameter counts from model names."""
     # Look for patterns like "8B", "12B", "70B", etc.
-    match = re.search(r'(\d+)B', model_name, re.IGNORECASE)
-    if match:
-        return float(match.group(1))
-    return 7.0  # Default fallback
-
-def determine_precision(model_name, tier):
-    """Determine model precision based on name and tier."""
-    if 'MoE' in model_name or 'mixtral' in model_name.lower():
-        return "MoE"
-    elif 'AWQ' in model_name:
-        return "AWQ"
-    elif 'fp8' in model_name.lower():
-        return "fp8"
-    else:
-        return "fp16"
+    params = model_name.str.extract(_PARAM_RE, expand=False)
+    return params.astype(float).fillna(7.0)  # Default fallback
+
+def determine_precision(model_name):
+    """Determine model precision based on name."""
+    return pd.Series(np.select(
+        [
+            model_name.str.contains('MoE') | model_name.str.contains('mixtral', case=False),
+            model_name.str.contains('AWQ'),
+            model_name.str.contains('fp8', case=False),
+        ],
+        ["MoE", "AWQ", "fp8"],
+        default="fp16",
+    ), index=model_name.index)
 
 def determine_gpu_type(recommended_gpu):
     """Determine GPU type from recommended GPU."""
-    if 'H100' in recommended_gpu:
-        return "H100"
-    elif 'A100' in recommended_gpu:
-        return "A100"
-    elif '3090' in recommended_gpu:
-        return "RTX 3090"
-    elif '3080' in recommended_gpu:
-        return "RTX 3080"
-    else:
-        return "A100"  # Default
+    return pd.Series(np.select(
+        [recommended_gpu.str.contains(needle) for needle in ('H100', 'A100', '3090', '3080')],
+        ["H100", "A100", "RTX 3090", "RTX 3080"],
+        default="A100",
+    ), index=recommended_gpu.index)
 
-def create_model_config(row):
-    """Create a ModelConfig from Excel row."""
-    model_name = row['Model'].strip()
-    tier = clean_tier_name(row['Tier'])
-    
-    # Determine if it's a free model
-    is_free = '免费' in row['Tier'] or '入门' in row['Tier']
-    
-    # Extract parameters
-    parameters_b = extract_parameters(model_name)
-    
-    # Determine precision
-    precision = determine_precision(model_name, tier)
-    
-    # Determine GPU type
-    gpu_type = determine_gpu_type(row['Recommended GPU'])
-    
-    # Calculate total TPS per GPU
-    total_tps = row['Total TPS']
-    gpu_count = row['GPU Count']
-    tokens_per_gpu_tps = total_tps / gpu_count if gpu_count > 0 else total_tps
+# Context window estimate per cleaned tier; anything else gets 8K
+_TIER_CONTEXT_WINDOWS = {"Enterprise": "200K", "Premium": "128K", "Standard": "32K"}
+
+_TEXT_COLUMNS = ('Model', 'Tier', 'Recommended GPU')
+_NUMERIC_COLUMNS = ('Total TPS', 'GPU Count', 'Input Token Price (per M)', 'Output Token Price (per M)')
+
+def invalid_cells(df):
+    """Mark the cells add_model_columns cannot convert: missing, non-text or non-finite values."""
+    bad = pd.DataFrame(index=df.index)
+    for column in _TEXT_COLUMNS:
+        bad[column] = ~df[column].map(lambda value: isinstance(value, str))
+    for column in _NUMERIC_COLUMNS:
+        bad[column] = ~np.isfinite(pd.to_numeric(df[column], errors='coerce'))
+    return bad
+
+def add_model_columns(df):
+    """Derive every ModelConfig field from the raw sheet columns in one pass per column.
+    
+    Expects rows that invalid_cells accepts.
+    """
+    df = df.copy()
+    for column in _NUMERIC_COLUMNS:
+        df[column] = pd.to_numeric(df[column])
+    model_name = df['Model'].str.strip()
+    df['model_name'] = model_name
+    df['tier_clean'] = clean_tier_name(df['Tier'])
+    df['is_free'] = df['Tier'].str.contains(_TIER_KEYWORDS["Free/Entry"])
+    df['parameters_b'] = extract_parameters(model_name)
+    df['precision'] = determine_precision(model_name)
+    df['gpu_type'] = determine_gpu_type(df['Recommended GPU'])
+    
+    # Total TPS per GPU; rows without a GPU count keep the total
+    gpu_count = df['GPU Count']
+    df['tokens_per_gpu_tps'] = (df['Total TPS'] / gpu_count.where(gpu_count > 0, 1)).astype(int)
     
     # Create slug (simplified)
-    slug = f"custom/{model_name.lower().replace(' ', '-')}"
-    
-    # Create context window (estimate based on tier)
-    if tier == "Enterprise":
-        context_window = "200K"
-    elif tier == "Premium":
-        context_window = "128K"
-    elif tier == "Standard":
-        context_window = "32K"
-    else:
-        context_window = "8K"
-    
+    df['slug'] = "custom/" + model_name.str.lower().str.replace(' ', '-', regex=False)
+    df['context_window'] = df['tier_clean'].map(_TIER_CONTEXT_WINDOWS).fillna("8K")
+    return df
+
+def create_model_config(row):
+    """Create a ModelConfig from a row tuple of add_model_columns + identifier_columns output."""
     return ModelConfig(
-        name=model_name,
-        slug=slug,
-        parameters_b=parameters_b,
-        context_window=context_window,
-        precision=precision,
-        typical_gpu=gpu_type,
-        input_price_per_m=f"${row['Input Token Price (per M)']:.2f}",
-        output_price_per_m=f"${row['Output Token Price (per M)']:.2f}",
-        tokens_per_gpu_tps=int(tokens_per_gpu_tps),
+        name=row.model_name,
+        slug=row.slug,
+        parameters_b=row.parameters_b,
+        context_window=row.context_window,
+        precision=row.precision,
+        typical_gpu=row.gpu_type,
+        input_price_per_m=f"${row.Input_Token_Price__per_M_:.2f}",
+        output_price_per_m=f"${row.Output_Token_Price__per_M_:.2f}",
+        tokens_per_gpu_tps=row.tokens_per_gpu_tps,
         openrouter_link="",  # Will need to be added manually
-        description=f"{tier} tier model from Excel data",
-        is_free=is_free,
-        is_moe=precision == "MoE",
-        is_awq=precision == "AWQ"
+        description=f"{row.tier_clean} tier model from Excel data",
+        is_free=row.is_free,
+        is_moe=row.precision == "MoE",
+        is_awq=row.precision == "AWQ"
     )
 
+def identifier_columns(df):
+    """Rename columns to identifiers so itertuples exposes them as attributes.
+    
+    e.g. 'Input Token Price (per M)' -> 'Input_Token_Price__per_M_'.
+    """
+    return df.rename(columns=lambda c: re.sub(r'\W', '_', c))
+
 def main():
     """Main function to convert Excel to models."""
     print("Reading Excel file...")
@@ -121,15 +134,21 @@ def main():
     print(f"Found {len(df)} models in Excel file")
     print("\nColumns:", df.columns.tolist())
     
+    # Skip malformed rows up front so one bad cell does not abort the column operations
+    bad = invalid_cells(df)
+    skipped = bad.any(axis=1)
+    for index, row_bad in bad[skipped].iterrows():
+        print(f"✗ Skipping row {index}: missing or invalid {', '.join(row_bad.index[row_bad])}")
+    
     # Convert each row to ModelConfig
     excel_models = []
-    for index, row in df.iterrows():
+    for row in identifier_columns(add_model_columns(df[~skipped])).itertuples(name="Row"):
         try:
             model_config = create_model_config(row)
             excel_models.append(model_config)
             print(f"✓ Converted: {model_config.name} ({model_config.parameters_b}B, {model_config.precision})")
         except Exception as e:
-            print(f"✗ Error converting row {index}: {e}")
+            print(f"✗ Error converting row {row.Index}: {e}")
     
     print(f"\nSuccessfully converted {len(excel_models)} models")
     
@@ -154,48 +173,20 @@ def main():
     print("CODE TO ADD TO model_settings.py:")
     print("="*60)
     
-    print("\n# Excel Models - Free Tier")
-    for model in [m for m in excel_models if m.is_free]:
-        print(f"""    ModelConfig(
-        name="{model.name}",
-        slug="{model.slug}",
-        parameters_b={model.parameters_b},
-        context_window="{model.context_window}",
-        precision="{model.precision}",
-        typical_gpu="{model.typical_gpu}",
-        input_price_per_m="{model.input_price_per_m}",
-        output_price_per_m="{model.output_price_per_m}",
-        tokens_per_gpu_tps={model.tokens_per_gpu_tps},
-        openrouter_link="",
-        description="{model.description}",
-        is_free=True,
-        is_moe={str(model.is_moe)},
-        is_awq={str(model.is_awq)}
-    ),""")
-    
-    print("\n# Excel Models - Paid Tier")
-    for model in [m for m in excel_models if not m.is_free]:
-        print(f"""    ModelConfig(
-        name="{model.name}",
-        slug="{model.slug}",
-        parameters_b={model.parameters_b},
-        context_window="{model.context_window}",
-        precision="{model.precision}",
-        typical_gpu="{model.typical_gpu}",
-        input_price_per_m="{model.input_price_per_m}",
-        output_price_per_m="{model.output_price_per_m}",
-        tokens_per_gpu_tps={model.tokens_per_gpu_tps},
-        openrouter_link="",
-        description="{model.description}",
-        is_free=False,
-        is_moe={str(model.is_moe)},
-        is_awq={str(model.is_awq)}
-    ),""")
+    print("\n# Rows for _ROWS (name, slug, parameters_b, context_window, precision, typical_gpu, tokens_per_gpu_tps, tier)")
+    for model in excel_models:
+        tier = model.description.replace(" tier model from Excel data", "")
+        if (model.input_price_per_m, model.output_price_per_m) != (_DEFAULT_INPUT_PRICE, _DEFAULT_OUTPUT_PRICE):
+            print(f"    # {model.name}: non-default pricing {model.input_price_per_m}/{model.output_price_per_m}, "
+                  f"add it as a full ModelConfig instead")
+            continue
+        print(f'    ("{model.name}", "{model.slug}", {model.parameters_b}, "{model.context_window}", '
+              f'"{model.precision}", "{model.typical_gpu}", {model.tokens_per_gpu_tps}, "{tier}"),')
     
     print("\n" + "="*60)
     print("Next steps:")
     print("1. Copy the code above")
-    print("2. Add to FREE_MODELS or PAID_MODELS in model_settings.py")
+    print("2. Add the rows to _ROWS in model_settings.py")
     print("3. Restart the calculators to see the new models")
     print("="*60)
 
@@ -204,13 +204,13 @@ class GPUSettingsAnalyzer:
                 continue
             
             # Calculate required GPU count
-            required_gpus = max(1, int(target_tps / model.tokens_per_gpu_tps))
+            required_gpus = max(1, int(-(-target_tps // model.tokens_per_gpu_tps)))
             
             # Analyze costs
             cost_analysis = self.analyze_cost_efficiency(
                 gpu, required_gpus, target_tps, 
-                float(model.input_price_per_m.replace('$', '') if model.input_price_per_m else 0),
-                float(model.output_price_per_m.replace('$', '') if model.output_price_per_m else 0)
+                model.input_price_float,
+                model.output_price_float
             )
             
             comparison = {
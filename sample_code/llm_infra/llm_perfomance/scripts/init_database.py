@@ -64,8 +64,8 @@ def populate_models_from_excel(db: DatabaseManager):
             context_window=model.context_window,
             precision=model.precision,
             typical_gpu=model.typical_gpu,
-            input_price_per_m=float(model.input_price_per_m.replace('$', '')) if model.input_price_per_m and model.input_price_per_m != '-' else 0.0,
-            output_price_per_m=float(model.output_price_per_m.replace('$', '')) if model.output_price_per_m and model.output_price_per_m != '-' else 0.0,
+            input_price_per_m=model.input_price_float,
+            output_price_per_m=model.output_price_float,
             tokens_per_gpu_tps=model.tokens_per_gpu_tps,
             openrouter_link=model.openrouter_link or "",
             description=model.description or "",
@@ -117,8 +117,8 @@ def show_database_stats():
     print(f"  • Favorites: {len(favorites)}")
     
     # History stats
-    history = db.get_calculation_history(limit=1000)
-    print(f"\nCalculation History: {len(history)} entries")
+    history_count = sum(1 for _ in db.iter_calculation_history(limit=1000))
+    print(f"\nCalculation History: {history_count} entries")
     
     # User preferences
     default_gpu_cost = db.get_user_preference("default_gpu_cost", "Not set")
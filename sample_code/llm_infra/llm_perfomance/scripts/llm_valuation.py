@@ -1,7 +1,9 @@
-from fastapi import FastAPI, Request, Form
-from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from fastapi import FastAPI, Form
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
+from jinja2 import Template
+from functools import lru_cache
+from typing import Annotated, Any, Dict, Tuple
 import uvicorn
 import os
 
@@ -48,6 +50,21 @@ models = [
     {"Model": "DeepSeek‑V3‑0324‑AWQ (MoE 671B, self-hosted)", "Slug": "deepseek/deepseek-v3-0324-awq", "Parameters (B)": "671B MoE (AWQ)", "Context window": "128K", "Precision": "AWQ MoE", "Typical GPU": "H100", "Input $/M": "-", "Output $/M": "-", "Tokens per GPU TPS": 700},
 ]
 
+def parse_context_window(context_window) -> Tuple[int, str]:
+    """Parse a context window (e.g., '128K') into (max tokens, display label)."""
+    if isinstance(context_window, int):
+        return context_window, f"{int(context_window/1000)}K"
+    if isinstance(context_window, str) and context_window.endswith("K"):
+        try:
+            return int(float(context_window[:-1]) * 1000), context_window
+        except ValueError:
+            return 32768, context_window
+    return 32768, str(context_window)
+
+# Per-model (max tokens, context window label), parsed once at import
+MODEL_CTX = {m["Model"]: parse_context_window(m["Context window"]) for m in models}
+MAX_CONTEXT_ACROSS_MODELS = max(max_tokens for max_tokens, _ in MODEL_CTX.values())
+
 # vLLM recommended parameters for 8xH100 80GB
 VLLM_PARAMS = [
     ("--tensor-parallel-size", "8", "One per GPU"),
@@ -71,16 +88,18 @@ VLLM_COMMAND = (
     "--enable-flash-attn"
 )
 
-# Setup FastAPI and templates
+# Setup FastAPI and static files
 templates_dir = os.path.join(os.path.dirname(__file__), "templates")
-os.makedirs(templates_dir, exist_ok=True)
+static_dir = os.path.join(templates_dir, "static")
+os.makedirs(static_dir, exist_ok=True)
 app = FastAPI()
-app.mount("/static", StaticFiles(directory=os.path.join(templates_dir, "static")), name="static")
-templates = Jinja2Templates(directory=templates_dir)
+app.mount("/static", StaticFiles(directory=static_dir, check_dir=False, html=False), name="static")
 
-template_path = os.path.join(templates_dir, "calculator.html")
-with open(template_path, "w") as f:
-    f.write('''
+TOKEN_NOTE = "For most use cases, 512–4096 tokens per request is recommended. The maximum allowed is determined by the model's context window."
+DEFAULT_TOKENS_PER_REQUEST = 2048
+STATIC_PAGE_HEADERS = {"Cache-Control": "public, max-age=3600"}
+
+CALCULATOR_TEMPLATE = Template('''
 <!DOCTYPE html>
 <html>
 <head>
@@ -104,7 +123,7 @@ with open(template_path, "w") as f:
 <body>
 <div class="container">
     <h1>OpenRouter Model Throughput Calculator</h1>
-    <form method="post">
+    <form id="calc-form" method="post" action="/api/calc">
         <label for="model">Model:</label>
         <select name="model" id="model">
             {% for m in models %}
@@ -115,25 +134,15 @@ with open(template_path, "w") as f:
         <input type="number" name="tokens_per_request" id="tokens_per_request" value="{{ tokens_per_request }}" min="1" max="32768" required>
         <button type="submit">Calculate</button>
     </form>
-    {% if warning %}<div class="warning">{{ warning }}</div>{% endif %}
+    <div class="warning" id="warning" hidden></div>
     <div class="token-note">{{ token_note }}</div>
-    {% if model_params %}
+    <div id="results" hidden>
     <div class="section-title">OpenRouter Model Parameters</div>
-    <table>
-        {% for k, v in model_params.items() %}
-        <tr><th>{{ k }}</th><td>{{ v }}</td></tr>
-        {% endfor %}
-    </table>
+    <table id="model-params"></table>
     <div class="section-title">Self-Hosted 8×H100 80GB Throughput</div>
-    <table>
-        {% for k, v in throughput.items() %}
-        <tr><th>{{ k }}</th><td>{{ v }}</td></tr>
-        {% endfor %}
-    </table>
+    <table id="throughput"></table>
     <div class="value-note">Est. value per day = 70% × Daily capacity (M tokens) × Output $/M</div>
-    {% if suggestion %}
-    <div class="suggestion">{{ suggestion|safe }}</div>
-    {% endif %}
+    <div class="suggestion" id="suggestion" hidden></div>
     <div class="section-title">Recommended vLLM Parameters for 8×H100 80GB</div>
     <table class="vllm-table">
         <thead><tr><th>Parameter</th><th>Recommended Value</th><th>Notes</th></tr></thead>
@@ -147,11 +156,71 @@ with open(template_path, "w") as f:
         <b>Sample vLLM launch command:</b><br/>
         <code>{{ vllm_command }}</code>
     </div>
-    {% endif %}
+    </div>
 </div>
+<script>
+    const form = document.getElementById('calc-form');
+
+    function fillTable(table, rows) {
+        table.innerHTML = '';
+        for (const [key, value] of Object.entries(rows)) {
+            if (key === 'OpenRouter Link' && !value) continue;
+            const tr = table.insertRow();
+            const th = document.createElement('th');
+            th.textContent = key;
+            tr.appendChild(th);
+            const td = tr.insertCell();
+            if (key === 'OpenRouter Link') {
+                const a = document.createElement('a');
+                a.href = value;
+                a.target = '_blank';
+                a.textContent = value;
+                td.appendChild(a);
+            } else {
+                td.textContent = value;
+            }
+        }
+    }
+
+    function showWarning(message) {
+        const warning = document.getElementById('warning');
+        warning.textContent = message || '';
+        warning.hidden = !message;
+    }
+
+    form.addEventListener('submit', async (event) => {
+        event.preventDefault();
+        const response = await fetch('/api/calc', { method: 'POST', body: new FormData(form) });
+        const data = await response.json();
+        if (!response.ok) {
+            showWarning(Array.isArray(data.detail) ? data.detail.map(d => d.msg).join('; ') : 'Calculation failed.');
+            return;
+        }
+        showWarning(data.warning);
+        document.getElementById('tokens_per_request').value = data.tpr;
+        fillTable(document.getElementById('model-params'), data.model_params);
+        fillTable(document.getElementById('throughput'), data.throughput);
+        const suggestion = document.getElementById('suggestion');
+        suggestion.innerHTML = data.suggestion || '';
+        suggestion.hidden = !data.suggestion;
+        document.getElementById('results').hidden = false;
+    });
+</script>
 </body>
 </html>
-''')
+''', autoescape=True)
+
+# Render the page once at import; results are filled in client-side from /api/calc
+calculator_page_path = os.path.join(static_dir, "calculator.html")
+with open(calculator_page_path, "w") as f:
+    f.write(CALCULATOR_TEMPLATE.render(
+        models=models,
+        selected_model=models[0]["Model"],
+        tokens_per_request=DEFAULT_TOKENS_PER_REQUEST,
+        vllm_params=VLLM_PARAMS,
+        vllm_command=VLLM_COMMAND,
+        token_note=TOKEN_NOTE,
+    ))
 
 def get_model_info(model_name: str):
     for m in models:
@@ -163,51 +232,25 @@ def get_model_info(model_name: str):
             return m
     return models[0]
 
-@app.get("/", response_class=HTMLResponse)
-async def calculator_form(request: Request):
-    # Reasonable default for tokens per request
-    default_tokens = 2048
-    return templates.TemplateResponse("calculator.html", {
-        "request": request,
-        "models": models,
-        "selected_model": models[0]["Model"],
-        "tokens_per_request": default_tokens,
-        "model_params": None,
-        "throughput": None,
-        "suggestion": None,
-        "vllm_params": VLLM_PARAMS,
-        "vllm_command": VLLM_COMMAND,
-        "warning": None,
-        "token_note": "For most use cases, 512–4096 tokens per request is recommended. The maximum allowed is determined by the model's context window."
-    })
+@app.get("/")
+async def calculator_form():
+    return FileResponse(calculator_page_path, media_type="text/html", headers=STATIC_PAGE_HEADERS)
 
-@app.post("/", response_class=HTMLResponse)
-async def calculator_submit(request: Request, model: str = Form(...), tokens_per_request: int = Form(...)):
+@lru_cache(maxsize=2048)
+def _compute(model: str, tokens_per_request: int) -> Dict[str, Any]:
+    """Compute calculator results; pure in (model, tokens_per_request), so safe to memoize."""
     m = get_model_info(model)
     awq_model = get_model_info("DeepSeek‑V3‑0324‑AWQ (MoE 671B, self-hosted)")
     tokens_per_gpu_tps = awq_model.get("Tokens per GPU TPS", 700)
     cluster_tps = tokens_per_gpu_tps * GPU_COUNT
     max_concurrent_users = int(cluster_tps / TOKENS_PER_USER_STREAM)
+    # Rounded before the value estimate, so the estimate is based on the capacity shown
     daily_capacity_mtokens = round(cluster_tps * 86400 / 1_000_000, 1)
-    # Parse context window as integer (e.g., '128K' -> 128000)
-    context_window = awq_model["Context window"]
-    if isinstance(context_window, int):
-        max_tokens = context_window
-        context_window_k = f"{int(context_window/1000)}K"
-    else:
-        if isinstance(context_window, str) and context_window.endswith("K"):
-            try:
-                max_tokens = int(float(context_window[:-1]) * 1000)
-            except Exception:
-                max_tokens = 32768
-            context_window_k = context_window
-        else:
-            max_tokens = 32768
-            context_window_k = str(context_window)
+    # Clamp to the self-hosted model's context window
+    max_tokens, context_window_k = MODEL_CTX[awq_model["Model"]]
+    tpr = min(tokens_per_request, max_tokens)
     warning = None
-    tpr = tokens_per_request
-    if tpr > max_tokens:
-        tpr = max_tokens
+    if tpr != tokens_per_request:
         warning = f"Tokens per request was limited to the model's maximum context window: {context_window_k} tokens."
     # Calculate estimated value generated per day at 70% capacity (if price info available)
     # Prefer the selected model's output price, fallback to self-hosted if not available
@@ -217,8 +260,7 @@ async def calculator_submit(request: Request, model: str = Form(...), tokens_per
     try:
         if output_price_str and output_price_str.startswith("$"):
             output_price = float(output_price_str[1:])
-            value_per_day = round(daily_capacity_mtokens * 0.7 * output_price, 2)
-            value_per_day_str = f"${value_per_day:,}"
+            value_per_day_str = f"${daily_capacity_mtokens * 0.7 * output_price:,.2f}"
         else:
             value_per_day_str = "-"
     except Exception:
@@ -226,7 +268,7 @@ async def calculator_submit(request: Request, model: str = Form(...), tokens_per
     throughput = {
         "Cluster TPS (hardware)": cluster_tps,
         "Concurrent users (hardware)": max_concurrent_users,
-        "Daily capacity (M tokens, hardware)": daily_capacity_mtokens,
+        "Daily capacity (M tokens, hardware)": f"{daily_capacity_mtokens:,.1f}",
         "Max tokens per request (K)": m["Context window"],
         "Est. value generated per day (USD, 70% capacity)": value_per_day_str,
     }
@@ -242,19 +284,21 @@ async def calculator_submit(request: Request, model: str = Form(...), tokens_per
         "Output $/M": m["Output $/M"],
         "OpenRouter Link": m.get("OpenRouter Link", "")
     }
-    return templates.TemplateResponse("calculator.html", {
-        "request": request,
-        "models": models,
-        "selected_model": model,
-        "tokens_per_request": tpr,
-        "model_params": model_params,
+    return {
         "throughput": throughput,
+        "model_params": model_params,
         "suggestion": suggestion,
-        "vllm_params": VLLM_PARAMS,
-        "vllm_command": VLLM_COMMAND,
         "warning": warning,
-        "token_note": "For most use cases, 512–4096 tokens per request is recommended. The maximum allowed is determined by the model's context window."
-    })
+        "tpr": tpr,
+    }
+
+@app.post("/api/calc", response_class=ORJSONResponse)
+async def calculator_api(
+    model: Annotated[str, Form()],
+    tokens_per_request: Annotated[int, Form(ge=1, le=MAX_CONTEXT_ACROSS_MODELS)],
+):
+    # Key the cache on the resolved model name so unknown names share one entry
+    return ORJSONResponse(_compute(get_model_info(model)["Model"], tokens_per_request))
 
 if __name__ == "__main__":
     uvicorn.run("llm_valuation:app", host="0.0.0.0", port=8000, reload=True)
@@ -61,6 +61,15 @@ def migrate_database(db_path: str = "llm_calculator.db"):
             print("Adding real_output_tps_per_gpu column to deployment_configs table...")
             cursor.execute("ALTER TABLE deployment_configs ADD COLUMN real_output_tps_per_gpu INTEGER DEFAULT 0")
         
+        # Generated columns are only listed by table_xinfo
+        cursor.execute("PRAGMA table_xinfo(deployment_configs)")
+        deployment_columns = [column[1] for column in cursor.fetchall()]
+        
+        if 'total_tps' not in deployment_columns:
+            print("Adding total_tps generated column to deployment_configs table...")
+            cursor.execute("ALTER TABLE deployment_configs ADD COLUMN total_tps INTEGER "
+                           "GENERATED ALWAYS AS (input_tps + output_tps) VIRTUAL")
+        
         conn.commit()
         print("Database migration completed successfully!")
 
@@ -6,10 +6,24 @@ This file contains preset models, pricing data, and configuration options
 for LLM deployment analysis and profitability calculations.
 """
 
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+import sys
+from typing import Dict, Iterable, List, Mapping, Optional, Any, Sequence, Tuple, Union
+from dataclasses import dataclass, field
+from functools import cache, lru_cache
+from operator import attrgetter
+from types import MappingProxyType
 
-@dataclass
+import numpy as np
+
+def format_price(price_str: str) -> float:
+    """Convert price string to float."""
+    if not price_str or price_str == "-":
+        return 0.0
+    return float(price_str.replace("$", ""))
+
+_INTERNED_FIELDS = ("precision", "context_window", "typical_gpu", "input_price_per_m", "output_price_per_m")
+
+@dataclass(slots=True, frozen=True)
 class ModelConfig:
     """Configuration for a single model."""
     name: str
@@ -26,471 +40,336 @@ class ModelConfig:
     is_free: bool = False
     is_moe: bool = False
     is_awq: bool = False
+    input_price_float: float = field(init=False, repr=False, compare=False)
+    output_price_float: float = field(init=False, repr=False, compare=False)
 
-# GPU Infrastructure Presets
-GPU_PRESETS = {
-    "8x_H100_80GB": {
-        "name": "8× H100 80GB",
-        "gpu_count": 8,
-        "gpu_cost_per_hour": 2.0,
-        "total_vram_gb": 640,
-        "typical_models": ["DeepSeek-V3-0324-AWQ", "Llama-3-70B", "Mixtral-8x7B"],
-        "description": "High-performance cluster for large models"
-    },
-    "4x_H100_80GB": {
-        "name": "4× H100 80GB", 
-        "gpu_count": 4,
-        "gpu_cost_per_hour": 2.0,
-        "total_vram_gb": 320,
-        "typical_models": ["DeepSeek-Coder-33B", "Llama-3-8B", "Mistral-7B"],
-        "description": "Mid-range cluster for medium models"
-    },
-    "2x_H100_80GB": {
-        "name": "2× H100 80GB",
-        "gpu_count": 2, 
-        "gpu_cost_per_hour": 2.0,
-        "total_vram_gb": 160,
-        "typical_models": ["Llama-3-8B", "Mistral-7B", "Gemma-7B"],
-        "description": "Entry-level cluster for smaller models"
-    },
-    "8x_A100_80GB": {
-        "name": "8× A100 80GB",
-        "gpu_count": 8,
-        "gpu_cost_per_hour": 1.5,
-        "total_vram_gb": 640,
-        "typical_models": ["DeepSeek-V3-0324", "Llama-3-70B"],
-        "description": "Cost-effective alternative to H100"
-    },
-    "Cloud_H100": {
-        "name": "Cloud H100 (RunPod)",
-        "gpu_count": 1,
-        "gpu_cost_per_hour": 2.99,
-        "total_vram_gb": 80,
-        "typical_models": ["DeepSeek-Coder-33B", "Llama-3-8B"],
-        "description": "Cloud-based H100 for testing"
-    }
-}
+    def __post_init__(self):
+        # Most presets repeat the same short strings; intern them so instances share one copy
+        for name in _INTERNED_FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                object.__setattr__(self, name, sys.intern(value))
+        # Parse the "$0.28" strings once instead of on every cost calculation
+        object.__setattr__(self, "input_price_float", format_price(self.input_price_per_m))
+        object.__setattr__(self, "output_price_float", format_price(self.output_price_per_m))
 
-# Model Presets - Free Models
-FREE_MODELS = [
-    # Excel Models - Free Tier
-    ModelConfig(
-        name="Stheno 8B",
-        slug="custom/stheno-8b",
-        parameters_b=8.0,
-        context_window="8K",
-        precision="fp16",
-        typical_gpu="RTX 3090",
-        input_price_per_m="$0.28",
-        output_price_per_m="$0.88",
-        tokens_per_gpu_tps=2000,
-        openrouter_link="",
-        description="Free/Entry tier model from Excel data",
-        is_free=True,
-        is_moe=False,
-        is_awq=False
-    ),
-    ModelConfig(
-        name="TheSpice 8B",
-        slug="custom/thespice-8b",
-        parameters_b=8.0,
-        context_window="8K",
-        precision="fp16",
-        typical_gpu="RTX 3090",
-        input_price_per_m="$0.28",
-        output_price_per_m="$0.88",
-        tokens_per_gpu_tps=2000,
-        openrouter_link="",
-        description="Free/Entry tier model from Excel data",
-        is_free=True,
-        is_moe=False,
-        is_awq=False
-    ),
-    ModelConfig(
-        name="Lyra 12B V4",
-        slug="custom/lyra-12b-v4",
-        parameters_b=12.0,
-        context_window="8K",
-        precision="fp16",
-        typical_gpu="RTX 3090",
-        input_price_per_m="$0.28",
-        output_price_per_m="$0.88",
-        tokens_per_gpu_tps=1700,
-        openrouter_link="",
-        description="Free/Entry tier model from Excel data",
-        is_free=True,
-        is_moe=False,
-        is_awq=False
-    )
-]
+# Integer milli-cents (1/100,000 of a dollar) keep sub-cent hourly rates exact through the roll-ups
+MILLICENTS_PER_DOLLAR = 100_000
 
-# Model Presets - Paid Models
-PAID_MODELS = [
-    # Excel Models - Paid Tier
-    ModelConfig(
-        name="Mixtral 8×7B",
-        slug="custom/mixtral-8×7b",
-        parameters_b=7.0,
-        context_window="32K",
-        precision="MoE",
-        typical_gpu="RTX 3090",
-        input_price_per_m="$0.28",
-        output_price_per_m="$0.88",
-        tokens_per_gpu_tps=3000,
-        openrouter_link="",
-        description="Standard tier model from Excel data",
-        is_free=False,
-        is_moe=True,
-        is_awq=False
-    ),
-    ModelConfig(
-        name="SpicedQ3 A3B 30B",
-        slug="custom/spicedq3-a3b-30b",
-        parameters_b=3.0,
-        context_window="32K",
-        precision="fp16",
-        typical_gpu="H100",
-        input_price_per_m="$0.28",
-        output_price_per_m="$0.88",
-        tokens_per_gpu_tps=1200,
-        openrouter_link="",
-        description="Standard tier model from Excel data",
-        is_free=False,
-        is_moe=False,
-        is_awq=False
-    ),
-    ModelConfig(
-        name="Magnum 12B",
-        slug="custom/magnum-12b",
-        parameters_b=12.0,
-        context_window="32K",
-        precision="fp16",
-        typical_gpu="RTX 3090",
-        input_price_per_m="$0.28",
-        output_price_per_m="$0.88",
-        tokens_per_gpu_tps=2100,
-        openrouter_link="",
-        description="Standard tier model from Excel data",
-        is_free=False,
-        is_moe=False,
-        is_awq=False
-    ),
-    ModelConfig(
-        name="Codex 24B",
-        slug="custom/codex-24b",
-        parameters_b=24.0,
-        context_window="32K",
-        precision="fp16",
-        typical_gpu="RTX 3080",
-        input_price_per_m="$0.28",
-        output_price_per_m="$0.88",
-        tokens_per_gpu_tps=1300,
-        openrouter_link="",
-        description="Standard tier model from Excel data",
-        is_free=False,
-        is_moe=False,
-        is_awq=False
-    ),
-    ModelConfig(
-        name="Shimizu 24B",
-        slug="custom/shimizu-24b",
-        parameters_b=24.0,
-        context_window="32K",
-        precision="fp16",
-        typical_gpu="RTX 3080",
-        input_price_per_m="$0.28",
-        output_price_per_m="$0.88",
-        tokens_per_gpu_tps=1300,
-        openrouter_link="",
-        description="Standard tier model from Excel data",
-        is_free=False,
-        is_moe=False,
-        is_awq=False
-    ),
-    ModelConfig(
-        name="DeepSeek-R1 70B Distill",
-        slug="custom/deepseek-r1-70b-distill",
-        parameters_b=70.0,
-        context_window="8K",
-        precision="fp16",
-        typical_gpu="A100",
-        input_price_per_m="$0.28",
-        output_price_per_m="$0.88",
-        tokens_per_gpu_tps=437,
-        openrouter_link="",
-        description="Premium tier model from Excel data",
-        is_free=False,
-        is_moe=False,
-        is_awq=False
-    ),
-    ModelConfig(
-        name="Euryale 70B",
-        slug="custom/euryale-70b",
-        parameters_b=70.0,
-        context_window="8K",
-        precision="fp16",
-        typical_gpu="A100",
-        input_price_per_m="$0.28",
-        output_price_per_m="$0.88",
-        tokens_per_gpu_tps=437,
-        openrouter_link="",
-        description="Premium tier model from Excel data",
-        is_free=False,
-        is_moe=False,
-        is_awq=False
-    ),
-    ModelConfig(
-        name="Magnum 72B",
-        slug="custom/magnum-72b",
-        parameters_b=72.0,
-        context_window="8K",
-        precision="fp16",
-        typical_gpu="A100",
-        input_price_per_m="$0.28",
-        output_price_per_m="$0.88",
-        tokens_per_gpu_tps=462,
-        openrouter_link="",
-        description="Premium tier model from Excel data",
-        is_free=False,
-        is_moe=False,
-        is_awq=False
+def to_millicents(amount: float) -> int:
+    """Convert a dollar amount to integer milli-cents."""
+    return int(round(amount * MILLICENTS_PER_DOLLAR))
+
+@dataclass(slots=True, frozen=True)
+class GPUPreset:
+    """GPU infrastructure preset."""
+    name: str
+    gpu_count: int
+    gpu_cost_per_hour: float
+    total_vram_gb: int
+    typical_models: Tuple[str, ...]
+    description: str
+    gpu_cost_per_hour_millicents: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "gpu_cost_per_hour_millicents", to_millicents(self.gpu_cost_per_hour))
+
+@dataclass(slots=True, frozen=True)
+class PricingTier:
+    """Market pricing tier (price ranges per million tokens)."""
+    name: str
+    input_price_range: Tuple[float, float]
+    output_price_range: Tuple[float, float]
+    models: Tuple[str, ...]
+
+@dataclass(slots=True, frozen=True)
+class VLLMPreset:
+    """vLLM deployment configuration preset."""
+    model: str
+    tensor_parallel_size: int
+    dtype: str
+    max_model_len: int
+    gpu_memory_utilization: float
+    max_num_seqs: int
+    max_num_batched_tokens: int
+    port: int
+    description: str
+
+# GPU Infrastructure Presets
+GPU_PRESETS = MappingProxyType({
+    "8x_H100_80GB": GPUPreset(
+        name="8× H100 80GB",
+        gpu_count=8,
+        gpu_cost_per_hour=2.0,
+        total_vram_gb=640,
+        typical_models=("DeepSeek-V3-0324-AWQ", "Llama-3-70B", "Mixtral-8x7B"),
+        description="High-performance cluster for large models"
     ),
-    ModelConfig(
-        name="WizardLM-2 8×22B",
-        slug="custom/wizardlm-2-8×22b",
-        parameters_b=22.0,
-        context_window="8K",
-        precision="fp16",
-        typical_gpu="RTX 3080",
-        input_price_per_m="$0.28",
-        output_price_per_m="$0.88",
-        tokens_per_gpu_tps=2250,
-        openrouter_link="",
-        description="Enterprise tier model from Excel data",
-        is_free=False,
-        is_moe=False,
-        is_awq=False
+    "4x_H100_80GB": GPUPreset(
+        name="4× H100 80GB", 
+        gpu_count=4,
+        gpu_cost_per_hour=2.0,
+        total_vram_gb=320,
+        typical_models=("DeepSeek-Coder-33B", "Llama-3-8B", "Mistral-7B"),
+        description="Mid-range cluster for medium models"
     ),
-    ModelConfig(
-        name="Qwen3 235B-A22B",
-        slug="custom/qwen3-235b-a22b",
-        parameters_b=235.0,
-        context_window="8K",
-        precision="fp16",
-        typical_gpu="RTX 3080",
-        input_price_per_m="$0.28",
-        output_price_per_m="$0.88",
-        tokens_per_gpu_tps=2350,
-        openrouter_link="",
-        description="Enterprise tier model from Excel data",
-        is_free=False,
-        is_moe=False,
-        is_awq=False
+    "2x_H100_80GB": GPUPreset(
+        name="2× H100 80GB",
+        gpu_count=2, 
+        gpu_cost_per_hour=2.0,
+        total_vram_gb=160,
+        typical_models=("Llama-3-8B", "Mistral-7B", "Gemma-7B"),
+        description="Entry-level cluster for smaller models"
     ),
-    ModelConfig(
-        name="Minimax 456B",
-        slug="custom/minimax-456b",
-        parameters_b=456.0,
-        context_window="8K",
-        precision="fp16",
-        typical_gpu="H100",
-        input_price_per_m="$0.28",
-        output_price_per_m="$0.88",
-        tokens_per_gpu_tps=1250,
-        openrouter_link="",
-        description="Enterprise tier model from Excel data",
-        is_free=False,
-        is_moe=False,
-        is_awq=False
+    "8x_A100_80GB": GPUPreset(
+        name="8× A100 80GB",
+        gpu_count=8,
+        gpu_cost_per_hour=1.5,
+        total_vram_gb=640,
+        typical_models=("DeepSeek-V3-0324", "Llama-3-70B"),
+        description="Cost-effective alternative to H100"
     ),
-    ModelConfig(
-        name="DeepSeek V3 671B",
-        slug="custom/deepseek-v3-671b",
-        parameters_b=671.0,
-        context_window="8K",
-        precision="fp16",
-        typical_gpu="H100",
-        input_price_per_m="$0.28",
-        output_price_per_m="$0.88",
-        tokens_per_gpu_tps=310,
-        openrouter_link="",
-        description="Enterprise tier model from Excel data",
-        is_free=False,
-        is_moe=False,
-        is_awq=False
+    "Cloud_H100": GPUPreset(
+        name="Cloud H100 (RunPod)",
+        gpu_count=1,
+        gpu_cost_per_hour=2.99,
+        total_vram_gb=80,
+        typical_models=("DeepSeek-Coder-33B", "Llama-3-8B"),
+        description="Cloud-based H100 for testing"
     )
+})
+
+# Model Presets (Excel models)
+# (name, slug, parameters_b, context_window, precision, typical_gpu, tokens_per_gpu_tps, tier)
+_ROWS = [
+    ("Stheno 8B", "custom/stheno-8b", 8.0, "8K", "fp16", "RTX 3090", 2000, "Free/Entry"),
+    ("TheSpice 8B", "custom/thespice-8b", 8.0, "8K", "fp16", "RTX 3090", 2000, "Free/Entry"),
+    ("Lyra 12B V4", "custom/lyra-12b-v4", 12.0, "8K", "fp16", "RTX 3090", 1700, "Free/Entry"),
+    ("Mixtral 8×7B", "custom/mixtral-8×7b", 7.0, "32K", "MoE", "RTX 3090", 3000, "Standard"),
+    ("SpicedQ3 A3B 30B", "custom/spicedq3-a3b-30b", 3.0, "32K", "fp16", "H100", 1200, "Standard"),
+    ("Magnum 12B", "custom/magnum-12b", 12.0, "32K", "fp16", "RTX 3090", 2100, "Standard"),
+    ("Codex 24B", "custom/codex-24b", 24.0, "32K", "fp16", "RTX 3080", 1300, "Standard"),
+    ("Shimizu 24B", "custom/shimizu-24b", 24.0, "32K", "fp16", "RTX 3080", 1300, "Standard"),
+    ("DeepSeek-R1 70B Distill", "custom/deepseek-r1-70b-distill", 70.0, "8K", "fp16", "A100", 437, "Premium"),
+    ("Euryale 70B", "custom/euryale-70b", 70.0, "8K", "fp16", "A100", 437, "Premium"),
+    ("Magnum 72B", "custom/magnum-72b", 72.0, "8K", "fp16", "A100", 462, "Premium"),
+    ("WizardLM-2 8×22B", "custom/wizardlm-2-8×22b", 22.0, "8K", "fp16", "RTX 3080", 2250, "Enterprise"),
+    ("Qwen3 235B-A22B", "custom/qwen3-235b-a22b", 235.0, "8K", "fp16", "RTX 3080", 2350, "Enterprise"),
+    ("Minimax 456B", "custom/minimax-456b", 456.0, "8K", "fp16", "H100", 1250, "Enterprise"),
+    ("DeepSeek V3 671B", "custom/deepseek-v3-671b", 671.0, "8K", "fp16", "H100", 310, "Enterprise"),
 ]
 
+# Every Excel model currently shares the same default pricing
+_DEFAULT_INPUT_PRICE = "$0.28"
+_DEFAULT_OUTPUT_PRICE = "$0.88"
+_FREE_TIER = "Free/Entry"
+
+def _build(row: Tuple) -> ModelConfig:
+    """Materialize a ModelConfig from a _ROWS entry."""
+    name, slug, parameters_b, context_window, precision, typical_gpu, tokens_per_gpu_tps, tier = row
+    return ModelConfig(
+        name=name,
+        slug=slug,
+        parameters_b=parameters_b,
+        context_window=context_window,
+        precision=precision,
+        typical_gpu=typical_gpu,
+        input_price_per_m=_DEFAULT_INPUT_PRICE,
+        output_price_per_m=_DEFAULT_OUTPUT_PRICE,
+        tokens_per_gpu_tps=tokens_per_gpu_tps,
+        openrouter_link="",
+        description=f"{tier} tier model from Excel data",
+        is_free=tier == _FREE_TIER,
+        is_moe=precision == "MoE",
+        is_awq=precision == "AWQ"
+    )
+
+FREE_MODELS = [_build(row) for row in _ROWS if row[-1] == _FREE_TIER]
+PAID_MODELS = [_build(row) for row in _ROWS if row[-1] != _FREE_TIER]
+
 # Combine all models
 ALL_MODELS = FREE_MODELS + PAID_MODELS
 
-# Pricing Tiers
-PRICING_TIERS = {
-    "budget": {
-        "name": "Budget",
-        "input_price_range": (0.05, 0.15),
-        "output_price_range": (0.15, 0.45),
-        "models": ["Llama 3.1 8B", "Mistral 7B", "Gemma 7B"]
-    },
-    "standard": {
-        "name": "Standard",
-        "input_price_range": (0.20, 0.50),
-        "output_price_range": (0.60, 1.50),
-        "models": ["Llama 3.1 70B", "Mixtral 8x7B", "Gemini Pro"]
-    },
-    "premium": {
-        "name": "Premium",
-        "input_price_range": (0.25, 3.00),
-        "output_price_range": (1.25, 15.00),
-        "models": ["Claude 3 Haiku", "Claude 3 Sonnet", "DeepSeek Chat"]
-    },
-    "enterprise": {
-        "name": "Enterprise",
-        "input_price_range": (3.00, 15.00),
-        "output_price_range": (15.00, 75.00),
-        "models": ["Claude 3 Opus", "Gemini Pro 1.5"]
-    }
+# Lookup indexes, built once at import
+_MODELS_BY_NAME: Dict[str, ModelConfig] = {m.name: m for m in ALL_MODELS}
+_MODELS_BY_SLUG: Dict[str, ModelConfig] = {m.slug: m for m in ALL_MODELS}
+_MOE_MODELS: Tuple[ModelConfig, ...] = tuple(m for m in ALL_MODELS if m.is_moe)
+_AWQ_MODELS: Tuple[ModelConfig, ...] = tuple(m for m in ALL_MODELS if m.is_awq)
+_ALL_MODELS_TUPLE: Tuple[ModelConfig, ...] = tuple(ALL_MODELS)
+_TYPE_MAP: Dict[str, Tuple[ModelConfig, ...]] = {
+    "free": tuple(FREE_MODELS),
+    "paid": tuple(PAID_MODELS),
+    "moe": _MOE_MODELS,
+    "awq": _AWQ_MODELS,
 }
 
+# Pricing Tiers
+PRICING_TIERS = MappingProxyType({
+    "budget": PricingTier(
+        name="Budget",
+        input_price_range=(0.05, 0.15),
+        output_price_range=(0.15, 0.45),
+        models=("Llama 3.1 8B", "Mistral 7B", "Gemma 7B")
+    ),
+    "standard": PricingTier(
+        name="Standard",
+        input_price_range=(0.20, 0.50),
+        output_price_range=(0.60, 1.50),
+        models=("Llama 3.1 70B", "Mixtral 8x7B", "Gemini Pro")
+    ),
+    "premium": PricingTier(
+        name="Premium",
+        input_price_range=(0.25, 3.00),
+        output_price_range=(1.25, 15.00),
+        models=("Claude 3 Haiku", "Claude 3 Sonnet", "DeepSeek Chat")
+    ),
+    "enterprise": PricingTier(
+        name="Enterprise",
+        input_price_range=(3.00, 15.00),
+        output_price_range=(15.00, 75.00),
+        models=("Claude 3 Opus", "Gemini Pro 1.5")
+    )
+})
+
 # vLLM Configuration Presets
-VLLM_PRESETS = {
-    "deepseek_v3_0324_awq": {
-        "model": "deepseek-ai/DeepSeek-V3-0324-AWQ",
-        "tensor_parallel_size": 8,
-        "dtype": "auto",
-        "max_model_len": 163000,
-        "gpu_memory_utilization": 0.90,
-        "max_num_seqs": 256,
-        "max_num_batched_tokens": 8192,
-        "port": 8000,
-        "description": "DeepSeek V3 0324 AWQ on 8× H100"
-    },
-    "llama_3_70b": {
-        "model": "meta-llama/Llama-3.1-70b-instruct",
-        "tensor_parallel_size": 4,
-        "dtype": "auto",
-        "max_model_len": 8192,
-        "gpu_memory_utilization": 0.90,
-        "max_num_seqs": 256,
-        "max_num_batched_tokens": 8192,
-        "port": 8000,
-        "description": "Llama 3.1 70B on 4× H100"
-    },
-    "mixtral_8x7b": {
-        "model": "mistralai/Mixtral-8x7B-Instruct-v0.1",
-        "tensor_parallel_size": 2,
-        "dtype": "auto",
-        "max_model_len": 32768,
-        "gpu_memory_utilization": 0.90,
-        "max_num_seqs": 256,
-        "max_num_batched_tokens": 8192,
-        "port": 8000,
-        "description": "Mixtral 8x7B on 2× H100"
-    }
-}
+VLLM_PRESETS = MappingProxyType({
+    "deepseek_v3_0324_awq": VLLMPreset(
+        model="deepseek-ai/DeepSeek-V3-0324-AWQ",
+        tensor_parallel_size=8,
+        dtype="auto",
+        max_model_len=163000,
+        gpu_memory_utilization=0.90,
+        max_num_seqs=256,
+        max_num_batched_tokens=8192,
+        port=8000,
+        description="DeepSeek V3 0324 AWQ on 8× H100"
+    ),
+    "llama_3_70b": VLLMPreset(
+        model="meta-llama/Llama-3.1-70b-instruct",
+        tensor_parallel_size=4,
+        dtype="auto",
+        max_model_len=8192,
+        gpu_memory_utilization=0.90,
+        max_num_seqs=256,
+        max_num_batched_tokens=8192,
+        port=8000,
+        description="Llama 3.1 70B on 4× H100"
+    ),
+    "mixtral_8x7b": VLLMPreset(
+        model="mistralai/Mixtral-8x7B-Instruct-v0.1",
+        tensor_parallel_size=2,
+        dtype="auto",
+        max_model_len=32768,
+        gpu_memory_utilization=0.90,
+        max_num_seqs=256,
+        max_num_batched_tokens=8192,
+        port=8000,
+        description="Mixtral 8x7B on 2× H100"
+    )
+})
 
 def get_model_by_name(name: str) -> Optional[ModelConfig]:
     """Get a model configuration by name."""
-    for model in ALL_MODELS:
-        if model.name == name:
-            return model
-    return None
+    return _MODELS_BY_NAME.get(name)
+
+def get_model_by_slug(slug: str) -> Optional[ModelConfig]:
+    """Get a model configuration by slug."""
+    return _MODELS_BY_SLUG.get(slug)
 
-def get_models_by_type(model_type: str) -> List[ModelConfig]:
+def get_models_by_type(model_type: str) -> Sequence[ModelConfig]:
     """Get models by type (free, paid, moe, awq)."""
-    if model_type == "free":
-        return FREE_MODELS
-    elif model_type == "paid":
-        return PAID_MODELS
-    elif model_type == "moe":
-        return [m for m in ALL_MODELS if m.is_moe]
-    elif model_type == "awq":
-        return [m for m in ALL_MODELS if m.is_awq]
-    else:
-        return ALL_MODELS
+    return _TYPE_MAP.get(model_type, _ALL_MODELS_TUPLE)
 
-def get_gpu_preset(name: str) -> Optional[Dict[str, Any]]:
+def get_gpu_preset(name: str) -> Optional[GPUPreset]:
     """Get GPU infrastructure preset by name."""
     return GPU_PRESETS.get(name)
 
-def get_vllm_preset(name: str) -> Optional[Dict[str, Any]]:
+def get_vllm_preset(name: str) -> Optional[VLLMPreset]:
     """Get vLLM configuration preset by name."""
     return VLLM_PRESETS.get(name)
 
-def format_price(price_str: str) -> float:
-    """Convert price string to float."""
-    if not price_str or price_str == "-":
-        return 0.0
-    return float(price_str.replace("$", ""))
+# (ModelConfig field, presentation key) in the order get_model_dict emits them
+_FIELD_RENAME = (
+    ("name", "Model"),
+    ("slug", "Slug"),
+    ("parameters_b", "Parameters (B)"),
+    ("context_window", "Context window"),
+    ("precision", "Precision"),
+    ("typical_gpu", "Typical GPU"),
+    ("input_price_per_m", "Input $/M"),
+    ("output_price_per_m", "Output $/M"),
+    ("tokens_per_gpu_tps", "Tokens per GPU TPS"),
+    ("openrouter_link", "OpenRouter Link"),
+    ("description", "Description"),
+    ("is_free", "Is Free"),
+    ("is_moe", "Is MoE"),
+    ("is_awq", "Is AWQ"),
+)
+_MODEL_DICT_KEYS = tuple(dst for _, dst in _FIELD_RENAME)
+_get_model_fields = attrgetter(*(src for src, _ in _FIELD_RENAME))
+# Placeholders for empty optional fields
+_EMPTY_DEFAULTS = (("Input $/M", "-"), ("Output $/M", "-"), ("OpenRouter Link", ""), ("Description", ""))
 
 def get_model_dict(model: ModelConfig) -> Dict[str, Any]:
     """Convert ModelConfig to dictionary format for compatibility."""
-    return {
-        "Model": model.name,
-        "Slug": model.slug,
-        "Parameters (B)": model.parameters_b,
-        "Context window": model.context_window,
-        "Precision": model.precision,
-        "Typical GPU": model.typical_gpu,
-        "Input $/M": model.input_price_per_m or "-",
-        "Output $/M": model.output_price_per_m or "-",
-        "Tokens per GPU TPS": model.tokens_per_gpu_tps,
-        "OpenRouter Link": model.openrouter_link or "",
-        "Description": model.description or "",
-        "Is Free": model.is_free,
-        "Is MoE": model.is_moe,
-        "Is AWQ": model.is_awq
-    } 
-
-def get_compatible_gpus(model: ModelConfig, gpu_configs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Get GPU configurations compatible with a given model."""
-    compatible_gpus = []
-    
-    # Estimate VRAM requirements based on model parameters and precision
-    estimated_vram = estimate_vram_requirement(model.parameters_b, model.precision)
-    
-    for gpu in gpu_configs:
-        if gpu["total_vram_gb"] >= estimated_vram:
-            compatible_gpus.append(gpu)
+    model_dict = dict(zip(_MODEL_DICT_KEYS, _get_model_fields(model)))
+    for key, default in _EMPTY_DEFAULTS:
+        if not model_dict[key]:
+            model_dict[key] = default
+    return model_dict
+
+# GPU catalogs come either as GPUPreset objects or as plain dicts (e.g. rows from the UI)
+GPUSpec = Union[GPUPreset, Mapping[str, Any]]
+
+def _gpu_field(gpu: GPUSpec, name: str) -> Any:
+    """Read a field from a GPUPreset or a GPU dict."""
+    return gpu[name] if isinstance(gpu, Mapping) else getattr(gpu, name)
+
+def _compatible_gpus(gpu_configs: Iterable[GPUSpec], parameters_b: float, precision: str) -> List[GPUSpec]:
+    """GPUs with enough VRAM, sorted by cost per GB of VRAM; ties keep their input order."""
+    estimated_vram = estimate_vram_requirement(parameters_b, precision)
+    compatible = [g for g in gpu_configs if _gpu_field(g, "total_vram_gb") >= estimated_vram]
+    compatible.sort(key=lambda g: _gpu_field(g, "gpu_cost_per_hour") / _gpu_field(g, "total_vram_gb"))
+    return compatible
+
+@lru_cache(maxsize=512)
+def _compatible_presets(parameters_b: float, precision: str) -> Tuple[GPUPreset, ...]:
+    """_compatible_gpus over the GPU_PRESETS catalog."""
+    return tuple(_compatible_gpus(GPU_PRESETS.values(), parameters_b, precision))
+
+def get_compatible_gpus(model: ModelConfig, gpu_configs: Optional[Sequence[GPUSpec]] = None) -> List[GPUSpec]:
+    """Get GPU configurations compatible with a given model.
     
-    # Sort by cost efficiency (cost per GB of VRAM)
-    compatible_gpus.sort(key=lambda g: g["gpu_cost_per_hour"] / g["total_vram_gb"])
-    return compatible_gpus
+    Without gpu_configs the GPU_PRESETS catalog is used, cached per model size and precision.
+    """
+    if gpu_configs is None:
+        return list(_compatible_presets(model.parameters_b, model.precision))
+    return _compatible_gpus(gpu_configs, model.parameters_b, model.precision)
+
+def clear_compatibility_cache():
+    """Drop cached GPU compatibility results."""
+    _compatible_presets.cache_clear()
+
+# VRAM multiplier per precision; MoE models need more, quantized models less
+_PRECISION_MULT: Dict[str, float] = {"fp16": 1.0, "fp8": 0.5, "MoE": 1.5, "AWQ": 0.3}
+
+# Minimum VRAM tiers (GB); estimates are rounded up to the next tier
+_VRAM_BUCKETS = np.array([8, 16, 24, 40, 80], dtype=np.int32)
 
+@cache
 def estimate_vram_requirement(parameters_b: float, precision: str) -> int:
     """Estimate VRAM requirement for a model."""
-    base_vram = parameters_b * 2  # Base requirement: 2GB per billion parameters
-    
-    # Adjust based on precision
-    if precision == "fp16":
-        multiplier = 1.0
-    elif precision == "fp8":
-        multiplier = 0.5
-    elif precision == "MoE":
-        multiplier = 1.5  # MoE models need more VRAM
-    elif precision == "AWQ":
-        multiplier = 0.3  # Quantized models need less VRAM
-    else:
-        multiplier = 1.0
-    
-    estimated_vram = int(base_vram * multiplier)
-    
-    # Minimum VRAM requirements
-    if estimated_vram < 8:
-        estimated_vram = 8
-    elif estimated_vram < 16:
-        estimated_vram = 16
-    elif estimated_vram < 24:
-        estimated_vram = 24
-    elif estimated_vram < 40:
-        estimated_vram = 40
-    elif estimated_vram < 80:
-        estimated_vram = 80
+    # Base requirement: 2GB per billion parameters
+    estimated_vram = int(parameters_b * 2 * _PRECISION_MULT.get(precision, 1.0))
     
+    idx = int(np.searchsorted(_VRAM_BUCKETS, estimated_vram, side="right"))
+    if idx < len(_VRAM_BUCKETS):
+        return int(_VRAM_BUCKETS[idx])
+    # Past the largest tier the raw estimate is the requirement
     return estimated_vram
 
-def get_optimal_gpu_config(model: ModelConfig, gpu_configs: List[Dict[str, Any]], 
-                          budget_constraint: float = None) -> Optional[Dict[str, Any]]:
+def get_optimal_gpu_config(model: ModelConfig, gpu_configs: Optional[Sequence[GPUSpec]] = None, 
+                          budget_constraint: float = None) -> Optional[GPUSpec]:
     """Get the optimal GPU configuration for a model within budget constraints."""
     compatible_gpus = get_compatible_gpus(model, gpu_configs)
     
@@ -499,7 +378,7 @@ def get_optimal_gpu_config(model: ModelConfig, gpu_configs: List[Dict[str, Any]]
     
     # Filter by budget if specified
     if budget_constraint:
-        compatible_gpus = [g for g in compatible_gpus if g["gpu_cost_per_hour"] <= budget_constraint]
+        compatible_gpus = [g for g in compatible_gpus if _gpu_field(g, "gpu_cost_per_hour") <= budget_constraint]
     
     if not compatible_gpus:
         return None
@@ -507,29 +386,71 @@ def get_optimal_gpu_config(model: ModelConfig, gpu_configs: List[Dict[str, Any]]
     # Return the most cost-effective option
     return compatible_gpus[0]
 
-def calculate_gpu_scaling(model: ModelConfig, gpu_config: Dict[str, Any], 
+def calculate_gpu_scaling(model: ModelConfig, gpu_config: GPUSpec, 
                          target_tps: int) -> Dict[str, Any]:
     """Calculate GPU scaling requirements for a target TPS."""
     # Estimate single GPU TPS based on model parameters
     base_tps_per_gpu = model.tokens_per_gpu_tps
     
-    # Calculate required GPU count
-    required_gpus = max(1, int(target_tps / base_tps_per_gpu))
+    # Calculate required GPU count (ceiling division: partial capacity still needs a GPU)
+    required_gpus = max(1, int(-(-target_tps // base_tps_per_gpu)))
     
-    # Calculate costs
-    hourly_cost = gpu_config["gpu_cost_per_hour"] * required_gpus
-    daily_cost = hourly_cost * 24
-    monthly_cost = daily_cost * 30
+    # Calculate costs in integer milli-cents so the daily/monthly roll-ups stay exact
+    if isinstance(gpu_config, GPUPreset):
+        rate_millicents = gpu_config.gpu_cost_per_hour_millicents
+    else:
+        rate_millicents = to_millicents(gpu_config["gpu_cost_per_hour"])
+    hourly_cost_millicents = rate_millicents * required_gpus
+    daily_cost_millicents = hourly_cost_millicents * 24
+    monthly_cost_millicents = daily_cost_millicents * 30
     
     # Calculate efficiency metrics
     efficiency = (target_tps / (required_gpus * base_tps_per_gpu)) * 100
     
     return {
         "required_gpus": required_gpus,
-        "hourly_cost": hourly_cost,
-        "daily_cost": daily_cost,
-        "monthly_cost": monthly_cost,
+        "hourly_cost": hourly_cost_millicents / MILLICENTS_PER_DOLLAR,
+        "daily_cost": daily_cost_millicents / MILLICENTS_PER_DOLLAR,
+        "monthly_cost": monthly_cost_millicents / MILLICENTS_PER_DOLLAR,
         "efficiency_percentage": efficiency,
         "tps_per_gpu": base_tps_per_gpu,
-        "total_vram": gpu_config["total_vram_gb"] * required_gpus
-    } 
\ No newline at end of file
+        "total_vram": _gpu_field(gpu_config, "total_vram_gb") * required_gpus
+    }
+
+def calculate_gpu_scaling_vec(targets: np.ndarray, tps_per_gpu: int,
+                              cost_per_hour: float) -> Dict[str, np.ndarray]:
+    """Vectorized calculate_gpu_scaling over an array of target TPS values."""
+    targets = np.asarray(targets, dtype=np.float64)
+    required_gpus = np.maximum(1, np.ceil(targets / tps_per_gpu)).astype(np.int32)
+    return {
+        "required_gpus": required_gpus,
+        "hourly_cost": cost_per_hour * required_gpus,
+        "efficiency_percentage": targets / (required_gpus * tps_per_gpu) * 100,
+    }
+
+# Columnar (struct-of-arrays) view of ALL_MODELS for bulk calculations.
+# Index i in every array corresponds to ALL_MODELS[i].
+_MODEL_ARRAYS: Dict[str, np.ndarray] = {
+    "parameters_b": np.fromiter((m.parameters_b for m in ALL_MODELS), dtype=np.float32, count=len(ALL_MODELS)),
+    "tps": np.fromiter((m.tokens_per_gpu_tps for m in ALL_MODELS), dtype=np.float32, count=len(ALL_MODELS)),
+    "in_price": np.fromiter((m.input_price_float for m in ALL_MODELS), dtype=np.float32, count=len(ALL_MODELS)),
+    "out_price": np.fromiter((m.output_price_float for m in ALL_MODELS), dtype=np.float32, count=len(ALL_MODELS)),
+    "vram_gb": np.fromiter((estimate_vram_requirement(m.parameters_b, m.precision) for m in ALL_MODELS),
+                           dtype=np.int32, count=len(ALL_MODELS)),
+}
+
+def compatible_mask(vram_budget: float) -> np.ndarray:
+    """Boolean mask over ALL_MODELS of models whose estimated VRAM fits the budget."""
+    return np.greater_equal(vram_budget, _MODEL_ARRAYS["vram_gb"])
+
+def scale_costs(target_tps: float, cost_per_hour: float) -> Dict[str, np.ndarray]:
+    """GPU count and hourly cost for every model in ALL_MODELS at a target TPS."""
+    required_gpus = np.maximum(1, np.ceil(target_tps / _MODEL_ARRAYS["tps"])).astype(np.int64)
+    return {
+        "required_gpus": required_gpus,
+        "hourly_cost": cost_per_hour * required_gpus,
+    }
+
+def get_compatible_models(vram_budget: float) -> List[ModelConfig]:
+    """Get the models that fit in a VRAM budget."""
+    return [ALL_MODELS[i] for i in np.flatnonzero(compatible_mask(vram_budget))]
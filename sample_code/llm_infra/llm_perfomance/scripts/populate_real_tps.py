@@ -35,22 +35,28 @@ def populate_real_tps_data():
     with db.get_connection() as conn:
         cursor = conn.cursor()
         
-        updated_count = 0
+        # Resolve which models exist with one query instead of checking rowcount per UPDATE
+        names = [model_name for model_name, _, _ in real_tps_data]
+        placeholders = ",".join("?" * len(names))
+        cursor.execute(f"SELECT name FROM model_configs WHERE name IN ({placeholders})", names)
+        existing = {row[0] for row in cursor}
+        
+        cursor.executemany("""
+            UPDATE model_configs 
+            SET real_input_tps_per_gpu = ?, real_output_tps_per_gpu = ?
+            WHERE name = ?
+        """, [(real_input_tps, real_output_tps, model_name)
+              for model_name, real_input_tps, real_output_tps in real_tps_data
+              if model_name in existing])
+        
         for model_name, real_input_tps, real_output_tps in real_tps_data:
-            cursor.execute("""
-                UPDATE model_configs 
-                SET real_input_tps_per_gpu = ?, real_output_tps_per_gpu = ?
-                WHERE name = ?
-            """, (real_input_tps, real_output_tps, model_name))
-            
-            if cursor.rowcount > 0:
-                updated_count += 1
+            if model_name in existing:
                 print(f"✓ Updated {model_name}: Input {real_input_tps} TPS, Output {real_output_tps} TPS")
             else:
                 print(f"✗ Model not found: {model_name}")
         
         conn.commit()
-        print(f"\nUpdated {updated_count} models with real TPS data")
+        print(f"\nUpdated {len(existing)} models with real TPS data")
 
 if __name__ == "__main__":
     print("Populating Real TPS Data...")
@@ -0,0 +1,30 @@
+import json
+import sqlite3
+
+from scripts.database import DatabaseManager, GPUConfig
+
+def test_import_retries_failed_batch_row_by_row(tmp_path):
+    db_path = str(tmp_path / "import.db")
+    db = DatabaseManager(db_path)
+    import_file = tmp_path / "import.json"
+    import_file.write_text(json.dumps({"gpu_configs": [
+        {"name": "Import A", "vram_gb": 24},
+        {"name": None, "vram_gb": 48},
+        {"name": "Import C", "vram_gb": 80},
+    ]}))
+
+    results = db.import_configurations_from_json(str(import_file))
+    db.close()
+
+    assert results["imported"]["gpu_configs"] == 2
+    assert len(results["errors"]) == 1
+    with sqlite3.connect(db_path) as conn:
+        names = [r[0] for r in conn.execute("SELECT name FROM gpu_configs WHERE name LIKE 'Import %' ORDER BY name")]
+    assert names == ["Import A", "Import C"]
+
+def test_table_counts_follow_writes(tmp_path):
+    db = DatabaseManager(str(tmp_path / "counts.db"))
+    before = db.get_database_info()["table_counts"]["gpu_configs"]
+    db.insert_gpu_config(GPUConfig(name="Counted GPU", vram_gb=24))
+    assert db.get_database_info()["table_counts"]["gpu_configs"] == before + 1
+    db.close()
@@ -0,0 +1,44 @@
+from dataclasses import asdict
+
+import numpy as np
+
+from scripts.model_settings import (
+    GPU_PRESETS, GPUPreset, calculate_gpu_scaling, calculate_gpu_scaling_vec, get_compatible_gpus, get_gpu_preset,
+    get_model_by_name, get_optimal_gpu_config,
+)
+
+MODEL = get_model_by_name("Stheno 8B")
+
+def test_presets_pass_straight_into_gpu_helpers():
+    presets = list(GPU_PRESETS.values())
+    compatible = get_compatible_gpus(MODEL, presets)
+    assert compatible and all(g in presets for g in compatible)
+    assert get_optimal_gpu_config(MODEL, presets) is compatible[0]
+    scaling = calculate_gpu_scaling(MODEL, get_gpu_preset("8x_H100_80GB"), 1000)
+    assert scaling["required_gpus"] >= 1
+    assert scaling["total_vram"] == 640 * scaling["required_gpus"]
+
+def test_gpu_helpers_accept_dicts():
+    presets = [asdict(g) for g in GPU_PRESETS.values()]
+    compatible = get_compatible_gpus(MODEL, presets)
+    assert [g["name"] for g in compatible] == [g.name for g in get_compatible_gpus(MODEL, list(GPU_PRESETS.values()))]
+    assert calculate_gpu_scaling(MODEL, presets[0], 1000)["required_gpus"] >= 1
+
+def test_scaling_keeps_sub_cent_rates_and_matches_vec():
+    gpu = {"name": "cheap", "gpu_count": 1, "gpu_cost_per_hour": 0.125, "total_vram_gb": 24}
+    scaling = calculate_gpu_scaling(MODEL, gpu, MODEL.tokens_per_gpu_tps)
+    assert scaling["monthly_cost"] == 90.0
+    vec = calculate_gpu_scaling_vec(np.array([MODEL.tokens_per_gpu_tps]), MODEL.tokens_per_gpu_tps, 0.125)
+    assert vec["required_gpus"][0] == scaling["required_gpus"]
+    assert vec["hourly_cost"][0] == scaling["hourly_cost"]
+    preset = GPUPreset("cheap", 1, 0.125, 24, (), "")
+    assert calculate_gpu_scaling(MODEL, preset, MODEL.tokens_per_gpu_tps)["monthly_cost"] == 90.0
+
+def test_compatible_gpus_default_catalog_and_tie_order():
+    assert get_compatible_gpus(MODEL) == get_compatible_gpus(MODEL, list(GPU_PRESETS.values()))
+    # Same cost per GB of VRAM: the caller's order is kept
+    gpus = [
+        {"name": "B", "gpu_cost_per_hour": 2.0, "total_vram_gb": 80},
+        {"name": "A", "gpu_cost_per_hour": 1.0, "total_vram_gb": 40},
+    ]
+    assert [g["name"] for g in get_compatible_gpus(MODEL, gpus)] == ["B", "A"]
@@ -7,7 +7,15 @@ This script updates the existing GPU costs in the database to match
 the user's specified pricing.
 """
 
-from database import DatabaseManager, GPUConfig
+from database import DatabaseManager
+
+# Target hourly cost per GPU name; monthly cost is derived as hourly * 24 * 30
+TARGET_GPU_COSTS = {
+    "NVIDIA A100 80GB": 1.8,
+    "NVIDIA H100 80GB": 2.0,
+    "NVIDIA RTX 3080": 0.55,
+    "NVIDIA RTX 3090": 0.75,
+}
 
 def update_gpu_costs():
     """Update GPU costs in the database."""
@@ -15,58 +23,26 @@ def update_gpu_costs():
     
     db = DatabaseManager()
     
-    # Get existing GPU configurations
-    gpus = db.get_gpu_configs(active_only=False)
+    # Collect every change first, then write them in a single transaction
+    rows = []
+    changed = []
+    for gpu in db.get_gpu_configs(active_only=False):
+        cost = TARGET_GPU_COSTS.get(gpu.name)
+        if cost is None:
+            continue
+        if gpu.cost_per_hour != cost:
+            rows.append((cost, cost * 24 * 30, gpu.id))
+            changed.append((gpu.name, cost))
+        else:
+            print(f"✓ {gpu.name} already has correct cost: ${gpu.cost_per_hour}/hour")
     
-    for gpu in gpus:
-        if gpu.name == "NVIDIA A100 80GB":
-            # Update A100 cost to $1.80/hour
-            gpu.cost_per_hour = 1.8
-            gpu.cost_per_month = 1.8 * 24 * 30  # 1296.0
-            success = db.update_gpu_config(gpu)
-            if success:
-                print(f"✓ Updated {gpu.name} cost to ${gpu.cost_per_hour}/hour")
-            else:
-                print(f"✗ Failed to update {gpu.name}")
-        
-        elif gpu.name == "NVIDIA H100 80GB":
-            # Ensure H100 cost is $2.00/hour
-            if gpu.cost_per_hour != 2.0:
-                gpu.cost_per_hour = 2.0
-                gpu.cost_per_month = 2.0 * 24 * 30  # 1440.0
-                success = db.update_gpu_config(gpu)
-                if success:
-                    print(f"✓ Updated {gpu.name} cost to ${gpu.cost_per_hour}/hour")
-                else:
-                    print(f"✗ Failed to update {gpu.name}")
-            else:
-                print(f"✓ {gpu.name} already has correct cost: ${gpu.cost_per_hour}/hour")
-        
-        elif gpu.name == "NVIDIA RTX 3080":
-            # Ensure RTX 3080 cost is $0.55/hour
-            if gpu.cost_per_hour != 0.55:
-                gpu.cost_per_hour = 0.55
-                gpu.cost_per_month = 0.55 * 24 * 30  # 396.0
-                success = db.update_gpu_config(gpu)
-                if success:
-                    print(f"✓ Updated {gpu.name} cost to ${gpu.cost_per_hour}/hour")
-                else:
-                    print(f"✗ Failed to update {gpu.name}")
-            else:
-                print(f"✓ {gpu.name} already has correct cost: ${gpu.cost_per_hour}/hour")
-        
-        elif gpu.name == "NVIDIA RTX 3090":
-            # Ensure RTX 3090 cost is $0.75/hour
-            if gpu.cost_per_hour != 0.75:
-                gpu.cost_per_hour = 0.75
-                gpu.cost_per_month = 0.75 * 24 * 30  # 540.0
-                success = db.update_gpu_config(gpu)
-                if success:
-                    print(f"✓ Updated {gpu.name} cost to ${gpu.cost_per_hour}/hour")
-                else:
-                    print(f"✗ Failed to update {gpu.name}")
-            else:
-                print(f"✓ {gpu.name} already has correct cost: ${gpu.cost_per_hour}/hour")
+    if rows:
+        try:
+            db.bulk_update_gpu_costs(rows)
+            for name, cost in changed:
+                print(f"✓ Updated {name} cost to ${cost}/hour")
+        except Exception as e:
+            print(f"✗ Failed to update GPU costs: {e}")
     
     print("\nGPU cost update complete!")
     
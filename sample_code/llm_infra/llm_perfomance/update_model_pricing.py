@@ -8,12 +8,9 @@ with more realistic and varied pricing based on model size and capabilities.
 """
 
 import sqlite3
-import sys
 import os
 
-# Add scripts directory to path
-sys.path.append('scripts')
-from database import DatabaseManager
+from scripts.database import DatabaseManager
 
 def update_model_pricing():
     """Update model pricing with realistic values."""
@@ -49,39 +46,20 @@ def update_model_pricing():
     print("🔄 Updating model pricing...")
     print("=" * 50)
     
-    updated_count = 0
-    for model_name, input_price, output_price in pricing_data:
-        try:
-            # Get the model config
-            model_configs = db.get_model_configs()
-            target_model = None
-            
-            for model in model_configs:
-                if model.name == model_name:
-                    target_model = model
-                    break
-            
-            if target_model:
-                # Update pricing
-                target_model.input_price_per_m = input_price
-                target_model.output_price_per_m = output_price
-                
-                # Update in database
-                success = db.update_model_config(target_model)
-                
-                if success:
-                    print(f"✅ {model_name}: ${input_price:.2f} → ${output_price:.2f}")
-                    updated_count += 1
-                else:
-                    print(f"❌ Failed to update {model_name}")
+    # All price changes are applied by one set-based UPDATE joined on the model name
+    updated = set()
+    try:
+        updated = set(db.bulk_update_model_pricing(pricing_data))
+        for model_name, input_price, output_price in pricing_data:
+            if model_name in updated:
+                print(f"✅ {model_name}: ${input_price:.2f} → ${output_price:.2f}")
             else:
                 print(f"⚠️  Model not found: {model_name}")
-                
-        except Exception as e:
-            print(f"❌ Error updating {model_name}: {str(e)}")
+    except Exception as e:
+        print(f"❌ Error updating model pricing: {str(e)}")
     
     print("=" * 50)
-    print(f"🎉 Updated {updated_count} out of {len(pricing_data)} models")
+    print(f"🎉 Updated {len(updated)} out of {len(pricing_data)} models")
     
     # Show updated pricing
     print("\n📊 Updated Model Pricing:")